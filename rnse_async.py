@@ -0,0 +1,225 @@
+"""
+RNSE ASYNC: Event-Loop Friendly Suite and Bundle Generation
+Version: 0.74-AUDIT
+
+Asyncio variants of run_full_suite() and create_publication_bundle() for
+embedding the suite in a job service. Engine runs and the bootstrap and
+permutation blocks go to a worker pool, integration and the point
+analysis to a helper thread, and result/bundle files are written off the
+loop, so the event loop stays responsive for the whole run.
+
+All async runs share one process pool (shared_pool()) unless a pool is
+passed explicitly. Cancelling a run cancels its queued engine and
+resampling tasks and frees its shared-memory blocks at the next await;
+tasks already running (one engine run or one resampling block each)
+finish in the background and their output is discarded. Helper-thread
+steps (integration, the point analysis, file writes) are short and run
+to completion. Results are identical to the synchronous functions.
+
+Author: Elad Genish
+License: MIT (core) + Proprietary (patent)
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from rnse_cache import TickCache
+from rnse_parallel import SharedArray, default_workers
+from rnse_publish import DEFAULT_OUTPUT_DIR, load_results, print_banner, write_bundle
+from rnse_resample import (
+    DEFAULT_LEVEL, PERMUTATION_BLOCKS, BootstrapCI, PermutationTest, block_plan, shared_block,
+    sort_by_radius, summarize_bootstrap, summarize_permutations
+)
+from rnse_test_suite import (
+    SUITE_BOOTSTRAP_RESAMPLES, SUITE_PARTICLES, SUITE_PERMUTATIONS, SUITE_PROFILE_BINS,
+    MultiThreadRNSE, SimulationConfig, _generate_signal, finish_suite, particle_speeds,
+    save_suite_results, start_suite
+)
+from rnse_ticks import DEFAULT_CHUNK_TICKS
+
+
+_shared_pool: Optional[ProcessPoolExecutor] = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Process pool shared by all async runs of this process, created on
+    first use. `max_workers` only applies to that first call.
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = ProcessPoolExecutor(max_workers=max_workers or default_workers())
+        return _shared_pool
+
+
+def shutdown_shared_pool():
+    """Shut down the shared pool (a later call to shared_pool() starts a new one)."""
+    global _shared_pool
+    with _shared_pool_lock:
+        pool, _shared_pool = _shared_pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+async def run_simulation_async(
+    sim: MultiThreadRNSE,
+    pool: Optional[Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_TICKS
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Awaitable MultiThreadRNSE.run(): engine runs on `pool`, writing into
+    shared memory; integration in a helper thread.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (coords, mass), as from sim.run()
+    """
+    loop = asyncio.get_running_loop()
+    pool = pool or shared_pool()
+    sim.print_header()
+
+    n = sim.config.n_particles
+    coords = SharedArray((n, len(sim.seeds)), np.float64)
+    mass = None
+    try:
+        mass = SharedArray((n,), np.float64)
+        await asyncio.gather(*(
+            loop.run_in_executor(pool, _generate_signal, task)
+            for task in sim.signal_tasks(chunk_size, coords, mass)
+        ))
+        raw_coords, raw_mass = coords.detach(), mass.detach()
+    finally:
+        coords.release()
+        if mass is not None:
+            mass.release()
+
+    await asyncio.to_thread(sim.integrate, raw_coords, chunk_size)
+    return raw_coords, raw_mass
+
+
+async def resample_async(
+    r: np.ndarray,
+    v: np.ndarray,
+    seed: int,
+    pool: Optional[Executor] = None,
+    n_resamples: int = SUITE_BOOTSTRAP_RESAMPLES,
+    n_permutations: int = SUITE_PERMUTATIONS
+) -> Tuple[BootstrapCI, PermutationTest]:
+    """
+    Awaitable bootstrap_ci() and two-sided permutation_test(): every block
+    of either is its own task on `pool`, reading the sorted particles from
+    shared memory.
+
+    Returns:
+        Tuple[BootstrapCI, PermutationTest]: As from the synchronous
+            functions with the same seed
+    """
+    loop = asyncio.get_running_loop()
+    pool = pool or shared_pool()
+    r_sorted, v_sorted = await asyncio.to_thread(sort_by_radius, r, v)
+
+    shared_r = SharedArray(r_sorted.shape, np.float64)
+    shared_v = None
+    try:
+        shared_v = SharedArray(v_sorted.shape, np.float64)
+        shared_r.array[:] = r_sorted
+        shared_v.array[:] = v_sorted
+
+        def blocks(kernel, n_draws, first_block):
+            return asyncio.gather(*(
+                loop.run_in_executor(
+                    pool, shared_block,
+                    (kernel, shared_r.spec(), shared_v.spec(), seed, block, size)
+                )
+                for block, size in block_plan(len(r_sorted), n_draws, first_block)
+            ))
+
+        replicates, null = await asyncio.gather(
+            blocks("bootstrap", n_resamples, 0),
+            blocks("permutation", n_permutations, PERMUTATION_BLOCKS)
+        )
+    finally:
+        shared_r.release()
+        if shared_v is not None:
+            shared_v.release()
+
+    return (
+        summarize_bootstrap(np.concatenate(replicates), DEFAULT_LEVEL, seed),
+        summarize_permutations(r_sorted, v_sorted, np.concatenate(null), "two-sided", seed)
+    )
+
+
+async def run_full_suite_async(
+    cache: Optional[TickCache] = None,
+    pool: Optional[Executor] = None,
+    output_file: Optional[str] = None
+) -> Dict:
+    """
+    Awaitable run_full_suite().
+
+    Args:
+        cache: Optional persistent tick cache
+        pool: Worker pool for engine runs and resampling blocks
+            (default: shared_pool())
+        output_file: Results JSON path; give distinct paths to concurrent
+            runs (default: rnse_results_<unix time>.json)
+
+    Returns:
+        Dict: Results package, as from run_full_suite()
+    """
+    pool = pool or shared_pool()
+    metadata, audit = start_suite()
+
+    config = SimulationConfig(n_particles=SUITE_PARTICLES, executor=pool)
+    sim = MultiThreadRNSE(config, cache=cache)
+    coords, mass = await run_simulation_async(sim, pool)
+    r, v = await asyncio.to_thread(particle_speeds, coords)
+    result = await asyncio.to_thread(
+        sim.analyze_rotation_curve, coords, mass, SUITE_PROFILE_BINS, speeds=(r, v)
+    )
+    result.bootstrap, result.permutation = await resample_async(r, v, config.rng_seed, pool)
+
+    results_package = finish_suite(metadata, audit, config, result)
+    await asyncio.to_thread(save_suite_results, results_package, output_file)
+    return results_package
+
+
+async def create_publication_bundle_async(
+    results_file: Optional[str] = None,
+    output_dir: str = DEFAULT_OUTPUT_DIR,
+    cache: Optional[TickCache] = None,
+    pool: Optional[Executor] = None
+) -> Path:
+    """
+    Awaitable create_publication_bundle().
+
+    Args:
+        results_file: Rebuild from this saved results.json instead of
+            running the suite
+        output_dir: Bundle directory; give distinct directories to
+            concurrent runs. A fresh run also saves its results JSON next
+            to it, as <output_dir>.results.json
+        cache: Optional persistent tick cache for a fresh run
+        pool: Worker pool for engine runs (default: shared_pool())
+
+    Returns:
+        Path: The bundle directory
+    """
+    print_banner()
+
+    if results_file is not None:
+        print(f"[1/4] Loading saved results from {results_file}...")
+        results_package = await asyncio.to_thread(load_results, results_file)
+    else:
+        print("[1/4] Running full test suite...")
+        results_package = await run_full_suite_async(
+            cache, pool, str(Path(output_dir).parent / (Path(output_dir).name + ".results.json"))
+        )
+
+    return await asyncio.to_thread(write_bundle, results_package, output_dir)
@@ -0,0 +1,485 @@
+"""
+RNSE BENCHMARKS: Ingest and Generation Cost Measurements
+Version: 0.74-AUDIT
+
+Micro-benchmarks for the hot paths of the test suite. Inputs are synthetic
+tick streams with the documented audit entry layout, and
+MultiThreadRNSE.run() is fed synthetic tick columns through `sources`, so
+the benchmarks run without the engine.
+
+Usage:
+    python rnse_bench.py [n_ticks]
+
+Author: Elad Genish
+License: MIT (core) + Proprietary (patent)
+"""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from rnse_parallel import SharedArray, default_workers, executor_for
+from rnse_resample import bootstrap_replicates, permutation_test, split_drop
+from rnse_stats import split_moments, stream_split
+from rnse_ticks import DEFAULT_CHUNK_TICKS, TICK_COLUMNS, TickColumns, project_lines, project_lines_parallel
+
+
+def synthetic_lines(n_ticks: int, seed: int = 0x5EEDBEEFCAFE1234) -> List[bytes]:
+    """Generate `n_ticks` JSON audit lines shaped like rnse_core output."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for name, dtype, width in TICK_COLUMNS:
+        shape = (n_ticks, width) if width > 1 else n_ticks
+        if np.dtype(dtype).kind == "f":
+            data[name] = rng.random(shape)
+        else:
+            data[name] = rng.integers(0, 2, shape).astype(dtype)
+    data["t"] = np.arange(n_ticks, dtype=np.int64)
+    data["seed64"][:] = seed
+    params = {"tau": 0.25, "q": 4, "window": 32, "alpha": 0.1, "merkle_R": None}
+    ticks = TickColumns(data=data, params=params, interp_labels=["accretion", "drift"])
+    return ticks.to_lines()
+
+
+def best_of(fn: Callable[[], object], repeats: int = 3) -> float:
+    """Best wall time of `repeats` calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _json_loads_loop(lines: List[bytes]):
+    # Reference: the original per-tick loop of MultiThreadRNSE.run
+    dim_x = []
+    dim_c = []
+    for line_bytes in lines:
+        data = json.loads(line_bytes.decode("utf-8"))
+        dim_x.append(data["x"])
+        dim_c.append(data["C"])
+    return np.array(dim_x), np.array(dim_c)
+
+
+def bench_decode(n_ticks: int = 100_000) -> Dict[str, float]:
+    """Compare the json.loads loop against the projection decoder."""
+    lines = synthetic_lines(n_ticks)
+
+    ref_x, ref_c = _json_loads_loop(lines)
+    proj = project_lines(lines, ("x", "C"))
+    assert np.array_equal(ref_x, proj["x"]) and np.array_equal(ref_c, proj["C"])
+
+    t_json = best_of(lambda: _json_loads_loop(lines))
+    t_proj = best_of(lambda: project_lines(lines, ("x", "C")))
+    return {
+        "n_ticks": n_ticks,
+        "json_loads_s": t_json,
+        "projection_s": t_proj,
+        "speedup": t_json / t_proj,
+    }
+
+
+def bench_parallel_decode(
+    n_ticks: int = 1_000_000,
+    worker_counts: Sequence[int] = (1, 2, 4, 8, 16, 32)
+) -> List[Dict[str, float]]:
+    """
+    Scaling of the process-pool projection decoder.
+
+    Worker counts above the available CPUs are still run (they measure
+    oversubscription) but flagged in the output.
+    """
+    lines = synthetic_lines(n_ticks)
+    ref = project_lines(lines, ("x", "C"))
+    chunk = max(1, n_ticks // (4 * max(worker_counts)))
+
+    rows = []
+    t_serial = best_of(lambda: project_lines(lines, ("x", "C")), repeats=1)
+    for workers in worker_counts:
+        out = project_lines_parallel(lines, ("x", "C"), workers, chunk)
+        assert all(np.array_equal(ref[k], out[k]) for k in ref)
+        t = best_of(lambda: project_lines_parallel(lines, ("x", "C"), workers, chunk), repeats=1)
+        rows.append({
+            "workers": workers,
+            "seconds": t,
+            "speedup": t_serial / t,
+            "oversubscribed": workers > default_workers(),
+        })
+    return rows
+
+
+def _legacy_assemble(sources: List[TickColumns], scale: float) -> np.ndarray:
+    # Reference: per-dimension copies + column_stack, as run() used to do
+    dims = []
+    for ticks in sources:
+        raw_signal = np.array(ticks["x"]) - 0.5
+        trajectory = np.cumsum(raw_signal)
+        max_val = np.max(np.abs(trajectory))
+        dims.append(trajectory * (scale / max_val))
+    return np.column_stack(dims)
+
+
+def _peak_rss_child(mode: str, n_ticks: int) -> int:
+    # Runs in a fresh interpreter: peak RSS growth (KiB) of one assembly
+    import resource
+    from rnse_test_suite import MultiThreadRNSE, SimulationConfig
+
+    rng = np.random.default_rng(0)
+    sources = [
+        TickColumns(data={"x": rng.random(n_ticks), "C": rng.random(n_ticks)})
+        for _ in range(3)
+    ]
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if mode == "legacy":
+        _legacy_assemble(sources, 100.0)
+    else:
+        sim = MultiThreadRNSE(SimulationConfig(n_particles=n_ticks))
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.run(sources=sources)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+
+
+def bench_assembly_memory(n_ticks: int = 10_000_000) -> Dict[str, float]:
+    """
+    Peak RSS growth of coordinate assembly, legacy pipeline vs run().
+
+    Each variant runs in its own interpreter because ru_maxrss is a
+    process-lifetime peak. Inputs are in-memory columns, so only assembly
+    is measured; one copy of the (N, 3) coordinates is the floor.
+    """
+    result = {"n_ticks": n_ticks, "coords_mib": n_ticks * 3 * 8 / 2**20}
+    for mode in ("legacy", "run"):
+        proc = subprocess.run(
+            [sys.executable, __file__, "--peak-rss", mode, str(n_ticks)],
+            capture_output=True, text=True, check=True
+        )
+        result[f"{mode}_mib"] = int(proc.stdout.split()[-1]) / 1024
+    return result
+
+
+def _pickled_column(task) -> np.ndarray:
+    # Pool worker: build one column and pickle it back to the parent
+    seed, n = task
+    return np.random.default_rng(seed).random(n)
+
+
+def _shared_column(task) -> int:
+    # Pool worker: build one column straight into the shared block
+    seed, n, dim, spec = task
+    block = SharedArray.attach(spec)
+    rng = np.random.default_rng(seed)
+    try:
+        for start in range(0, n, DEFAULT_CHUNK_TICKS):
+            stop = min(n, start + DEFAULT_CHUNK_TICKS)
+            block.array[start:stop, dim] = rng.random(stop - start)
+    finally:
+        block.close()
+    return dim
+
+
+def _assembly_child(mode: str, n: int, workers: int) -> str:
+    # Runs in a fresh interpreter: wall time and peak RSS (KiB, parent plus
+    # workers) of assembling an (n, 3) block on a process pool
+    import resource
+    start = time.perf_counter()
+    with executor_for("processes", workers) as pool:
+        if mode == "pickled":
+            coords = np.empty((n, 3))
+            for i, column in enumerate(pool.map(_pickled_column, [(i, n) for i in range(3)])):
+                coords[:, i] = column
+        else:
+            block = SharedArray((n, 3), np.float64)
+            try:
+                tasks = [(i, n, i, block.spec()) for i in range(3)]
+                for _ in pool.map(_shared_column, tasks):
+                    pass
+                coords = block.detach()
+            finally:
+                block.release()
+    seconds = time.perf_counter() - start
+    peak = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return f"{seconds} {peak}"
+
+
+def bench_shared_assembly(n: int = 10_000_000, workers: int = 3) -> Dict[str, float]:
+    """
+    Process-pool assembly of (N, 3) coordinates: columns pickled back to
+    the parent vs written by workers into one shared-memory block, as
+    MultiThreadRNSE.run() does. Use n=100_000_000 for the 10^8 case.
+
+    Peak RSS is the sum of the parent's and the largest worker's peak;
+    shared pages are counted in both, so it overstates the shared path.
+    """
+    result = {"n": n, "workers": workers, "coords_mib": n * 3 * 8 / 2**20}
+    for mode in ("pickled", "shared"):
+        proc = subprocess.run(
+            [sys.executable, __file__, "--assembly", mode, str(n), str(workers)],
+            capture_output=True, text=True, check=True
+        )
+        seconds, peak = proc.stdout.split()[-2:]
+        result[f"{mode}_s"] = float(seconds)
+        result[f"{mode}_mib"] = int(peak) / 1024
+    return result
+
+
+def _masked_split(r: np.ndarray, v: np.ndarray, split: float) -> tuple:
+    # Reference: the original two-mask analysis of analyze_rotation_curve
+    inner_mask = r < split
+    outer_mask = r > split
+    return (
+        np.mean(v[inner_mask]), np.std(v[inner_mask]), np.min(r[inner_mask]),
+        np.mean(v[outer_mask]), np.std(v[outer_mask]), np.max(r[outer_mask])
+    )
+
+
+def _peak_alloc_mib(fn: Callable[[], object]) -> float:
+    # Peak traced allocation (NumPy buffers included) during fn()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def bench_split_stats(n: int = 10_000_000) -> Dict[str, float]:
+    """
+    Inner/outer velocity metrics: masks + fancy indexing vs the fused
+    chunked kernel (rnse_stats.split_moments), time and peak temporaries.
+    """
+    rng = np.random.default_rng(0)
+    r = rng.random(n) * 100.0
+    v = 3.0 + rng.random(n)
+    split = float(np.median(r))
+
+    ref = _masked_split(r, v, split)
+    inner, outer = split_moments(r, v, split)
+    fused = (inner.mean, inner.std, inner.r_min, outer.mean, outer.std, outer.r_max)
+    max_rel = max(abs(a - b) / abs(a) for a, b in zip(ref, fused))
+
+    return {
+        "n": n,
+        "masked_s": best_of(lambda: _masked_split(r, v, split)),
+        "fused_s": best_of(lambda: split_moments(r, v, split)),
+        "threads_s": best_of(lambda: split_moments(r, v, split, executor="threads")),
+        "masked_mib": _peak_alloc_mib(lambda: _masked_split(r, v, split)),
+        "fused_mib": _peak_alloc_mib(lambda: split_moments(r, v, split)),
+        "max_rel_diff": max_rel,
+    }
+
+
+def _in_memory_split(coords: np.ndarray) -> float:
+    # analyze_rotation_curve()'s split over the full (N, 3) array
+    r = np.linalg.norm(coords, axis=1)
+    v = np.linalg.norm(np.gradient(coords, axis=0), axis=1) * 10.0
+    median = np.median(r)
+    return _masked_split(r, v, median)[0]
+
+
+def bench_streaming_split(n: int = 2_000_000, chunk_size: int = DEFAULT_CHUNK_TICKS) -> Dict[str, float]:
+    """
+    Inner/outer split of a chunked (N, 3) coords stream: in-memory arrays
+    vs rnse_stats.stream_split() (exact two-pass and single-pass sketch),
+    time and peak temporaries.
+    """
+    rng = np.random.default_rng(0)
+    coords = np.cumsum(rng.normal(size=(n, 3)), axis=0)
+    mass = rng.random(n)
+
+    def chunks():
+        for start in range(0, n, chunk_size):
+            yield coords[start:start + chunk_size], mass[start:start + chunk_size]
+
+    ref = _in_memory_split(coords)
+    approx = stream_split(chunks, exact=False)[1].mean
+    return {
+        "n": n,
+        "in_memory_s": best_of(lambda: _in_memory_split(coords)),
+        "exact_s": best_of(lambda: stream_split(chunks)),
+        "sketch_s": best_of(lambda: stream_split(chunks, exact=False)),
+        "in_memory_mib": _peak_alloc_mib(lambda: _in_memory_split(coords)),
+        "exact_mib": _peak_alloc_mib(lambda: stream_split(chunks)),
+        "sketch_mib": _peak_alloc_mib(lambda: stream_split(chunks, exact=False)),
+        "sketch_rel_diff": abs(approx - ref) / ref,
+    }
+
+
+def _looped_bootstrap(r: np.ndarray, v: np.ndarray, n_resamples: int) -> np.ndarray:
+    # Reference: one gather, median and masking pass per resample
+    rng = np.random.default_rng(0)
+    out = np.empty((n_resamples, 3))
+    for k in range(n_resamples):
+        idx = rng.integers(0, len(r), len(r))
+        rr, vv = r[idx], v[idx]
+        median = np.median(rr)
+        inner, outer = np.mean(vv[rr < median]), np.mean(vv[rr > median])
+        out[k] = 100.0 * (1.0 - outer / inner), inner, outer
+    return out
+
+
+def bench_bootstrap(n: int = 10_000, n_resamples: int = 2000) -> Dict[str, float]:
+    """
+    Bootstrap of the inner/outer split: a Python loop per resample vs
+    rnse_resample's vectorized blocks, serial and on a process pool.
+    """
+    rng = np.random.default_rng(0)
+    r = rng.random(n) * 100.0
+    v = 3.0 + rng.random(n)
+    return {
+        "n": n,
+        "n_resamples": n_resamples,
+        "looped_s": best_of(lambda: _looped_bootstrap(r, v, n_resamples), repeats=1),
+        "blocks_s": best_of(lambda: bootstrap_replicates(r, v, n_resamples)),
+        "processes_s": best_of(
+            lambda: bootstrap_replicates(r, v, n_resamples, executor="processes"), repeats=1
+        ),
+    }
+
+
+def _shuffled_drops(r: np.ndarray, v: np.ndarray, n_permutations: int) -> np.ndarray:
+    # Reference: one full shuffle of the speeds per permutation
+    rng = np.random.default_rng(0)
+    order = np.argsort(r, kind="stable")
+    v_sorted = v[order]
+    split = len(r) // 2
+    return np.array([
+        split_drop(rng.permutation(v_sorted)[None, :], split, split)[0]
+        for _ in range(n_permutations)
+    ])
+
+
+def bench_permutation(n: int = 10_000, n_permutations: int = 9999) -> Dict[str, float]:
+    """
+    Permutation test of the velocity drop: a Python loop of shuffles vs
+    rnse_resample's partitioned blocks, serial and on a process pool.
+    """
+    rng = np.random.default_rng(0)
+    r = rng.random(n) * 100.0
+    v = 3.0 + rng.random(n)
+    return {
+        "n": n,
+        "n_permutations": n_permutations,
+        "looped_s": best_of(lambda: _shuffled_drops(r, v, n_permutations), repeats=1),
+        "blocks_s": best_of(lambda: permutation_test(r, v, n_permutations), repeats=1),
+        "processes_s": best_of(
+            lambda: permutation_test(r, v, n_permutations, executor="processes"), repeats=1
+        ),
+    }
+
+
+def import_time_us(module: str) -> Dict[str, object]:
+    """
+    Cumulative import time of `module` in a fresh interpreter, from
+    `python -X importtime`, and whether it pulled in NumPy or the engine.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         f"import sys, {module}; print('numpy' in sys.modules, 'rnse_core' in sys.modules)"],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    cumulative = 0
+    for line in proc.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            cumulative = int(parts[1])
+    numpy_loaded, engine_loaded = proc.stdout.split()
+    return {
+        "cumulative_us": cumulative,
+        "imports_numpy": numpy_loaded == "True",
+        "imports_engine": engine_loaded == "True"
+    }
+
+
+def bench_import_time(
+    modules: Sequence[str] = ("rnse_caption", "rnse_publish", "rnse_test_suite")
+) -> Dict[str, Dict[str, object]]:
+    """
+    Import cost of the publication entry points.
+
+    These must stay free of NumPy and the engine so that rebuilding a
+    bundle from results.json is dominated by interpreter startup (see
+    rnse_test_suite.verify_import_time for the budgeted check).
+    """
+    results = {module: import_time_us(module) for module in modules}
+    for module, res in results.items():
+        assert not res["imports_numpy"], f"{module} imports NumPy at import time"
+    return results
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) == 4 and argv[1] == "--peak-rss":
+        print(_peak_rss_child(argv[2], int(argv[3])))
+        return 0
+    if len(argv) == 5 and argv[1] == "--assembly":
+        print(_assembly_child(argv[2], int(argv[3]), int(argv[4])))
+        return 0
+
+    n_ticks = int(argv[1]) if len(argv) > 1 else 100_000
+
+    print(f"[*] RNSE::BENCH_v0.74 ({n_ticks} ticks)")
+
+    res = bench_decode(n_ticks)
+    print("\n[DECODE x, C]")
+    print(f"  json.loads loop:        {res['json_loads_s']:.4f} s")
+    print(f"  Projection decoder:     {res['projection_s']:.4f} s")
+    print(f"  ► SPEEDUP:              {res['speedup']:.1f}x")
+
+    print(f"\n[PARALLEL DECODE] ({default_workers()} CPUs available)")
+    for row in bench_parallel_decode(n_ticks):
+        flag = " (oversubscribed)" if row["oversubscribed"] else ""
+        print(f"  {row['workers']:>3} workers:            "
+              f"{row['seconds']:.4f} s  {row['speedup']:.2f}x{flag}")
+
+    mem = bench_assembly_memory(n_ticks)
+    print(f"\n[ASSEMBLY PEAK RSS] (one copy of coords = {mem['coords_mib']:.1f} MiB)")
+    print(f"  Legacy column_stack:    {mem['legacy_mib']:.1f} MiB")
+    print(f"  run() in-place buffer:  {mem['run_mib']:.1f} MiB")
+
+    shm = bench_shared_assembly(n_ticks)
+    print(f"\n[POOL ASSEMBLY] ({shm['workers']} worker processes)")
+    print(f"  Pickled columns:        {shm['pickled_s']:.4f} s  {shm['pickled_mib']:.1f} MiB")
+    print(f"  Shared-memory block:    {shm['shared_s']:.4f} s  {shm['shared_mib']:.1f} MiB")
+
+    stats = bench_split_stats(n_ticks)
+    print(f"\n[INNER/OUTER STATS] (max rel. difference {stats['max_rel_diff']:.1e})")
+    print(f"  Masks + fancy indexing: {stats['masked_s']:.4f} s  {stats['masked_mib']:.1f} MiB peak")
+    print(f"  Fused kernel:           {stats['fused_s']:.4f} s  {stats['fused_mib']:.1f} MiB peak")
+    print(f"  Fused kernel, threads:  {stats['threads_s']:.4f} s")
+
+    streaming = bench_streaming_split(n_ticks)
+    print(f"\n[STREAMING SPLIT] (sketch inner velocity off by {streaming['sketch_rel_diff']:.1e})")
+    print(f"  In-memory arrays:       {streaming['in_memory_s']:.4f} s  {streaming['in_memory_mib']:.1f} MiB peak")
+    print(f"  Streaming, two-pass:    {streaming['exact_s']:.4f} s  {streaming['exact_mib']:.1f} MiB peak")
+    print(f"  Streaming, sketch only: {streaming['sketch_s']:.4f} s  {streaming['sketch_mib']:.1f} MiB peak")
+
+    boot = bench_bootstrap()
+    print(f"\n[BOOTSTRAP] ({boot['n_resamples']} resamples of {boot['n']} particles)")
+    print(f"  Loop per resample:      {boot['looped_s']:.4f} s")
+    print(f"  Vectorized blocks:      {boot['blocks_s']:.4f} s")
+    print(f"  Blocks, process pool:   {boot['processes_s']:.4f} s")
+
+    perm = bench_permutation()
+    print(f"\n[PERMUTATION TEST] ({perm['n_permutations']} permutations of {perm['n']} particles)")
+    print(f"  Loop of shuffles:       {perm['looped_s']:.4f} s")
+    print(f"  Partitioned blocks:     {perm['blocks_s']:.4f} s")
+    print(f"  Blocks, process pool:   {perm['processes_s']:.4f} s")
+
+    print("\n[IMPORT TIME] (python -X importtime, cumulative)")
+    for module, res in bench_import_time().items():
+        print(f"  {module + ':':<24}{res['cumulative_us'] / 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,307 @@
+"""
+RNSE TICK CACHE: Content-Addressed Persistent Store of Engine Output
+Version: 0.74-AUDIT
+
+Engine output is fully deterministic in (seed, ticks, RNSEParams) for a
+given rnse_core build, so it is cached on disk as tick stores (see
+rnse_store.py) keyed by a SHA-256 of (seed, RNSEParams) plus the engine
+version. Runs are prefixes of longer runs of the same stream, so shorter
+requests are sliced from the longest cached run, and longer ones resume
+from the engine state stored at its end when the engine supports
+checkpoints. The cache has a size
+budget and evicts least-recently-used entries.
+
+One cache directory may be shared by concurrent processes (pool workers,
+sweeps). Writing, pruning and eviction hold an exclusive lock on the
+directory, a new entry is opened before anything can be evicted, and an
+entry removed by another process is treated as a miss.
+
+Author: Elad Genish
+License: MIT (core) + Proprietary (patent)
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Not POSIX: writers are not serialized across processes
+    fcntl = None
+
+import rnse_core
+from rnse_store import TickStore, write_store
+from rnse_ticks import TickColumns
+
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "rnse"
+DEFAULT_CACHE_BYTES = 4 << 30  # 4 GiB
+STORE_SUFFIX = ".rtk"
+LOCK_NAME = ".lock"
+
+
+def params_dict(params) -> Dict:
+    """Plain-dict form of an RNSEParams instance."""
+    if dataclasses.is_dataclass(params):
+        return dataclasses.asdict(params)
+    return dict(vars(params))
+
+
+def engine_version() -> str:
+    """
+    Identify the rnse_core build: its declared version plus a hash of its
+    source, so an edited engine never reuses stale entries.
+    """
+    version = str(getattr(rnse_core, "__version__", "unversioned"))
+    source = getattr(rnse_core, "__file__", None)
+    if source and os.path.exists(source):
+        with open(source, "rb") as f:
+            version += "+" + hashlib.sha256(f.read()).hexdigest()[:16]
+    return version
+
+
+class TickCache:
+    """
+    Directory of tick stores addressed by the hash of their inputs.
+
+    Args:
+        root: Cache directory (created on demand)
+        max_bytes: Size budget; least-recently-used entries are evicted
+    """
+
+    def __init__(self, root: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.version = engine_version()
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Ticks requested from the engine by fetch() so far
+        self.engine_ticks = 0
+
+    def key(self, seed: int, params) -> str:
+        """
+        SHA-256 content address of one engine stream.
+
+        The tick count is not part of the key: a run of N ticks is a prefix
+        of any longer run with the same inputs, so entries are stored per
+        stream and shorter requests are served by slicing.
+        """
+        blob = json.dumps(
+            {
+                "seed": seed,
+                "params": params_dict(params),
+                "engine": self.version
+            },
+            sort_keys=True
+        ).encode("utf-8")
+        return hashlib.sha256(blob).hexdigest()
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold the cache directory's exclusive lock (shared by all processes)."""
+        with open(self.root / LOCK_NAME, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def path(self, key: str, n_ticks: int) -> Path:
+        return self.root / f"{key}-{n_ticks:012d}{STORE_SUFFIX}"
+
+    def prefixes(self, key: str) -> List[Tuple[int, Path]]:
+        """Cached (tick count, path) entries of one stream, shortest first."""
+        found = []
+        for p in self.root.glob(f"{key}-*{STORE_SUFFIX}"):
+            try:
+                found.append((int(p.name[len(key) + 1:-len(STORE_SUFFIX)]), p))
+            except ValueError:
+                continue
+        return sorted(found)
+
+    def get(self, seed: int, n_ticks: int, params) -> Optional[TickColumns]:
+        """
+        Return the first `n_ticks` ticks of the stream, or None on a miss.
+
+        Served from the shortest cached run covering `n_ticks`.
+        """
+        for length, path in self.prefixes(self.key(seed, params)):
+            if length < n_ticks:
+                continue
+            try:
+                store = TickStore(str(path))
+            except (FileNotFoundError, ValueError):
+                continue  # Evicted or replaced by another process
+            try:
+                os.utime(path)  # Mark as recently used
+            except FileNotFoundError:
+                pass  # Evicted since; the open mapping stays valid
+            return store.columns(0, n_ticks)
+        return None
+
+    def put(
+        self,
+        seed: int,
+        n_ticks: int,
+        params,
+        ticks: TickColumns,
+        merkle_roots: Optional[Sequence] = None,
+        engine_state: Optional[bytes] = None
+    ) -> TickStore:
+        """
+        Store one run's ticks atomically and enforce the size budget.
+
+        `engine_state`, the engine state after the last tick, lets fetch()
+        extend the run later without replaying it.
+
+        Shorter cached prefixes of the same stream become redundant and are
+        removed. The returned store is opened before any eviction, so it
+        stays readable even if another process evicts the entry later.
+        """
+        key = self.key(seed, params)
+        path = self.path(key, n_ticks)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        write_store(
+            str(tmp), ticks, seed=seed, merkle_roots=merkle_roots, engine_state=engine_state
+        )
+
+        with self.locked():
+            os.replace(tmp, path)
+            store = TickStore(str(path))
+            for length, p in self.prefixes(key):
+                if length < n_ticks:
+                    p.unlink(missing_ok=True)
+            self._evict(keep=path)
+        return store
+
+    def fetch(self, seed: int, n_ticks: int, params) -> TickColumns:
+        """
+        Ticks of the run, calling the engine only for what no cached run covers.
+
+        When rnse_core implements the checkpoint contract (see
+        rnse_checkpoint), runs are generated through rnse_resume() and
+        stored with the engine state after their last tick. A request
+        longer than a cached run then resumes from that state and
+        generates only the missing ticks. Without the contract, without a
+        stored state, or when Merkle roots are requested (they cover the
+        whole stream), the run is regenerated from tick 0. Either way the
+        longer run then replaces its prefixes.
+        """
+        from rnse_checkpoint import engine_states, supports_checkpoints
+
+        ticks = self.get(seed, n_ticks, params)
+        if ticks is not None:
+            return ticks
+
+        resumable = supports_checkpoints() and getattr(params, "merkle_R", None) is None
+        prefix = self._longest_prefix(seed, n_ticks, params) if resumable else None
+        if prefix is not None:
+            start = len(prefix)
+            res = rnse_core.rnse_resume(prefix.engine_state, n_ticks - start, params)
+            self.engine_ticks += n_ticks - start
+            ticks = TickColumns.concat([prefix.columns(), TickColumns.from_result(res)])
+        elif resumable:
+            # Tick 0 state: a one-tick checkpoint pass
+            state = engine_states((seed, 1, params, 1))[0]
+            res = rnse_core.rnse_resume(state, n_ticks, params)
+            self.engine_ticks += 1 + n_ticks
+            ticks = TickColumns.from_result(res)
+        else:
+            res = rnse_core.rnse_run(seed, n_ticks, params)
+            self.engine_ticks += n_ticks
+            ticks = TickColumns.from_result(res)
+        return self.put(
+            seed, n_ticks, params, ticks,
+            merkle_roots=res.get("merkle_roots") if not resumable else None,
+            engine_state=res.get("state") if resumable else None
+        ).columns()
+
+    def _longest_prefix(self, seed: int, n_ticks: int, params) -> Optional[TickStore]:
+        # Longest readable cached run shorter than n_ticks that recorded
+        # its end state (None if none)
+        for length, path in reversed(self.prefixes(self.key(seed, params))):
+            if not 0 < length < n_ticks:
+                continue
+            try:
+                store = TickStore(str(path))
+            except (FileNotFoundError, ValueError):
+                continue  # Evicted or replaced by another process
+            if store.engine_state is not None:
+                return store
+        return None
+
+    def _stat_entries(self) -> List[Tuple[Path, os.stat_result]]:
+        # (path, stat) of every cached store, least recently used first;
+        # entries removed by another process meanwhile are skipped
+        found = []
+        for p in self.root.glob("*" + STORE_SUFFIX):
+            try:
+                found.append((p, p.stat()))
+            except FileNotFoundError:
+                continue
+        return sorted(found, key=lambda entry: entry[1].st_mtime)
+
+    def entries(self) -> List[Path]:
+        """Cached stores, least recently used first."""
+        return [p for p, _ in self._stat_entries()]
+
+    def size_bytes(self) -> int:
+        return sum(st.st_size for _, st in self._stat_entries())
+
+    def evict(self, keep: Optional[Path] = None):
+        """Delete least-recently-used entries until within max_bytes."""
+        with self.locked():
+            self._evict(keep)
+
+    def _evict(self, keep: Optional[Path] = None):
+        # evict() with the directory lock already held
+        entries = self._stat_entries()
+        total = sum(st.st_size for _, st in entries)
+        for p, st in entries:
+            if total <= self.max_bytes:
+                break
+            if p == keep:
+                continue
+            total -= st.st_size
+            p.unlink(missing_ok=True)
+
+
+def verify_partial_hit(
+    root: str,
+    seed: int = 0x5EEDBEEFCAFE1234,
+    n_cached: int = 1000,
+    n_ticks: int = 1100
+) -> int:
+    """
+    Self-check: extending a cached run of `n_cached` ticks to `n_ticks`
+    must ask the engine for only the missing ticks and reproduce
+    rnse_run() exactly.
+
+    Returns:
+        int: Engine ticks spent on the partial hit
+
+    Raises:
+        RuntimeError: If rnse_core lacks the checkpoint contract
+        AssertionError: On extra engine work or any difference
+    """
+    from rnse_checkpoint import supports_checkpoints
+
+    if not supports_checkpoints():
+        raise RuntimeError("rnse_core does not implement rnse_checkpoints/rnse_resume")
+    params = rnse_core.RNSEParams()
+    cache = TickCache(root)
+    cache.fetch(seed, n_cached, params)
+    before = cache.engine_ticks
+    ticks = cache.fetch(seed, n_ticks, params)
+    spent = cache.engine_ticks - before
+    if spent != n_ticks - n_cached:
+        raise AssertionError(f"partial hit ran {spent} engine ticks, expected {n_ticks - n_cached}")
+    if ticks.to_lines() != TickColumns.from_result(rnse_core.rnse_run(seed, n_ticks, params)).to_lines():
+        raise AssertionError("resumed run differs from rnse_run")
+    return spent
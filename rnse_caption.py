@@ -0,0 +1,51 @@
+"""
+RNSE PUBLICATION CAPTION
+Version: 0.74-AUDIT
+
+Caption text for a rotation curve result. Kept free of NumPy and the
+engine so that bundle files can be rebuilt from a saved results.json
+without paying their import cost.
+
+Author: Elad Genish
+License: MIT (core) + Proprietary (patent)
+"""
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Dict, Union
+
+if TYPE_CHECKING:  # rnse_test_suite imports this module
+    from rnse_test_suite import RotationCurveResult
+
+
+def generate_publication_caption(result: Union["RotationCurveResult", Dict]) -> str:
+    """
+    Generate a publication-ready LinkedIn caption.
+    
+    Args:
+        result: RotationCurveResult, or its `to_dict()` form as saved in
+            results.json
+    """
+    if isinstance(result, dict):
+        result = SimpleNamespace(**result)
+    return f"""
+Just proved: RNSE generates flat rotation curves WITHOUT Dark Matter.
+
+Galaxy velocity profile from recursive null-seed integration:
+• Classical Physics expects >50% velocity drop at edge (Keplerian decline)
+• RNSE generates {result.velocity_drop_percent:.2f}% drop (stays flat)
+
+This means the "missing mass" signatures in real galaxies might be 
+computational geometry—not unknown particles.
+
+Every result is cryptographically audited. Same seed = identical output.
+Code is open. Results are reproducible.
+
+Median Radius: {result.median_radius:.1f} kpc
+Inner Velocity: {result.inner_velocity:.2f} km/s
+Outer Velocity: {result.outer_velocity:.2f} km/s
+Total Particles: {result.total_particles}
+
+Full audit package with code: [GitHub Link]
+
+#RNSE #Physics #ComputationalGeometry #DarkMatter #Innovation
+"""
@@ -0,0 +1,198 @@
+"""
+RNSE CHECKPOINTS: Segmented Generation and Resume of Long Engine Streams
+Version: 0.74-AUDIT
+
+A long engine stream is sequential because every tick depends on the
+window history. With engine checkpoints it can be cut into segments:
+
+1. A cheap first pass records the engine state at every segment start.
+2. Segments are then generated independently on all cores, each one
+   resumed from its state and decoded straight into its rows of the raw
+   (N, D) signal buffer.
+
+Integration runs afterwards over the assembled buffer (chunked, with the
+accretion offset carried across chunks), so segment boundaries leave no
+trace and the result is bit-identical to a whole-stream run.
+
+With a checkpoint directory the raw buffers are files, and finished
+segments are logged as they complete. A crashed run started again with
+the same configuration skips the recorded states and segments, instead
+of restarting every stream from tick 0.
+
+Engine contract (optional; segmented mode falls back to whole-stream
+runs when rnse_core lacks it):
+
+    rnse_core.rnse_checkpoints(seed, ticks, params, every) -> List[bytes]
+        Serialized engine state at ticks 0, every, 2*every, ... < ticks.
+    rnse_core.rnse_resume(state, ticks, params) -> result dict
+        The next `ticks` ticks after `state`, exactly as rnse_run emits them,
+        plus (optionally) `result["state"]`, the state after the last of
+        them. TickCache stores that end state to extend cached runs without
+        replaying them.
+
+Author: Elad Genish
+License: MIT (core) + Proprietary (patent)
+"""
+
+import hashlib
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Callable, List, Sequence, Set, Tuple
+
+import numpy as np
+
+import rnse_core
+from rnse_cache import engine_version, params_dict
+from rnse_parallel import SharedArray
+
+
+# One finished-segment record in the .done log: (dimension, start tick)
+_DONE_RECORD = struct.Struct("<qq")
+_FRAME = struct.Struct("<Q")
+
+
+def supports_checkpoints() -> bool:
+    """True when rnse_core implements the checkpoint/resume contract."""
+    return hasattr(rnse_core, "rnse_checkpoints") and hasattr(rnse_core, "rnse_resume")
+
+
+def plan_segments(n_ticks: int, segment_ticks: int) -> List[Tuple[int, int]]:
+    """(start, stop) tick ranges of at most `segment_ticks` covering n_ticks."""
+    if segment_ticks <= 0:
+        raise ValueError(f"segment_ticks must be positive, got {segment_ticks}")
+    return [
+        (start, min(n_ticks, start + segment_ticks))
+        for start in range(0, n_ticks, segment_ticks)
+    ]
+
+
+def engine_states(task) -> List[bytes]:
+    # Pool worker: first pass over one stream, states at segment starts
+    seed, n_ticks, params, segment_ticks = task
+    states = list(rnse_core.rnse_checkpoints(seed, n_ticks, params, segment_ticks))
+    expected = len(plan_segments(n_ticks, segment_ticks))
+    if len(states) < expected:
+        raise ValueError(f"rnse_checkpoints returned {len(states)} states, expected {expected}")
+    return states[:expected]
+
+
+def attach_buffer(spec) -> Tuple[np.ndarray, Callable[[], None]]:
+    """
+    Open a raw-signal buffer in a worker: a SharedArray spec or a
+    ("file", path, shape) spec from RunCheckpoint.
+
+    Returns:
+        Tuple[np.ndarray, Callable]: (array, release); release() flushes
+            file-backed writes or closes the shared-memory mapping
+    """
+    if spec[0] == "file":
+        _, path, shape = spec
+        array = np.memmap(path, dtype=np.float64, mode="r+", shape=tuple(shape))
+        return array, array.flush
+
+    shared = SharedArray.attach(spec)
+    return shared.array, shared.close
+
+
+class RunCheckpoint:
+    """
+    On-disk progress of one segmented run: raw coords and mass buffers,
+    engine states per dimension and a log of finished segments.
+
+    Files are keyed by a hash of everything that determines the raw
+    signals (seeds, tick count, params, engine build, segment length), so
+    a different run never picks up stale progress.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        seeds: Sequence[int],
+        n_ticks: int,
+        params,
+        segment_ticks: int
+    ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.shape = (n_ticks, len(seeds))
+        blob = json.dumps(
+            {
+                "seeds": list(seeds),
+                "n_ticks": n_ticks,
+                "params": params_dict(params),
+                "engine": engine_version(),
+                "segment_ticks": segment_ticks
+            },
+            sort_keys=True
+        ).encode("utf-8")
+        self.key = hashlib.sha256(blob).hexdigest()
+        self.coords_path = self.root / f"{self.key}.coords"
+        self.mass_path = self.root / f"{self.key}.mass"
+        self.states_path = self.root / f"{self.key}.states"
+        self.done_path = self.root / f"{self.key}.done"
+
+        for path, nbytes in (
+            (self.coords_path, n_ticks * len(seeds) * 8),
+            (self.mass_path, n_ticks * 8),
+        ):
+            with open(path, "ab") as f:
+                if f.tell() != nbytes:
+                    f.truncate(nbytes)
+
+    def coords_spec(self) -> Tuple:
+        return ("file", str(self.coords_path), self.shape)
+
+    def mass_spec(self) -> Tuple:
+        return ("file", str(self.mass_path), self.shape[:1])
+
+    def done(self) -> Set[Tuple[int, int]]:
+        """(dimension, start) of every segment already generated."""
+        if not self.done_path.exists():
+            return set()
+        blob = self.done_path.read_bytes()
+        usable = len(blob) - len(blob) % _DONE_RECORD.size
+        return set(_DONE_RECORD.iter_unpack(blob[:usable]))
+
+    def mark_done(self, dim: int, start: int):
+        """Durably record one finished segment (its rows are already flushed)."""
+        with open(self.done_path, "ab") as f:
+            f.write(_DONE_RECORD.pack(dim, start))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load_states(self) -> List[List[bytes]]:
+        """Stored engine states per dimension, or [] if none were saved."""
+        if not self.states_path.exists():
+            return []
+        blob = self.states_path.read_bytes()
+        values, pos = [], 0
+        while pos < len(blob):
+            (size,), pos = _FRAME.unpack_from(blob, pos), pos + _FRAME.size
+            values.append(blob[pos:pos + size])
+            pos += size
+        n_dims = self.shape[1]
+        per_dim = len(values) // n_dims if n_dims else 0
+        return [values[d * per_dim:(d + 1) * per_dim] for d in range(n_dims)]
+
+    def save_states(self, states: List[List[bytes]]):
+        """Atomically store the engine states of every dimension."""
+        tmp = self.states_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            for dim_states in states:
+                for state in dim_states:
+                    f.write(_FRAME.pack(len(state)))
+                    f.write(state)
+        os.replace(tmp, self.states_path)
+
+    def load(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Raw (coords, mass) read into memory."""
+        coords = np.fromfile(self.coords_path, dtype=np.float64).reshape(self.shape)
+        mass = np.fromfile(self.mass_path, dtype=np.float64)
+        return coords, mass
+
+    def remove(self):
+        """Delete this run's files once it has completed."""
+        for path in (self.coords_path, self.mass_path, self.states_path, self.done_path):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,547 @@
+"""
+RNSE CLUSTER: Coordinator/Worker Mode for Multi-Node Sweeps
+Version: 0.74-AUDIT
+
+A coordinator hands out sweep tasks over an authenticated TCP socket
+(multiprocessing.connection) and workers on any host run them and send
+back compact results: ENSEMBLE_DTYPE records for seed ensembles and
+GRID_DTYPE records for parameter grids, each carrying the pinned audit
+digest of its run. Results go to the same resumable files as
+rnse_sweep's run_ensemble() and run_grid(). Tasks are leased; a task
+whose worker disconnects (crash) or exceeds the lease timeout is
+dispatched again, and duplicate results are ignored.
+
+On a single box, run_local_cluster() starts local worker processes that
+stand in for nodes and respawns any that crash.
+
+Usage:
+    python rnse_cluster.py coordinator <results_file> <first_seed> <count> [host] [port]
+    python rnse_cluster.py grid-coordinator <results_file> [tau=...] [q=...] [window=...]
+                           [alpha=...] [n=<n_particles>] [host=<host>] [port=<port>]
+    python rnse_cluster.py worker <host> <port>
+
+Set RNSE_AUTHKEY to the same secret on the coordinator and all workers;
+there is no default. Tasks and results are pickled in both directions, so
+anyone holding the key can run code on the coordinator and on every
+worker. The coordinator listens on 127.0.0.1 unless a host is given.
+
+Author: Elad Genish
+License: MIT (core) + Proprietary (patent)
+"""
+
+import dataclasses
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import (
+    Client, Connection, Listener, answer_challenge, deliver_challenge
+)
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from rnse_sweep import (
+    ENSEMBLE_SEEDING, GRID_DTYPE, GRID_PARAMS, EnsembleStats, _ensemble_task, _grid_task,
+    check_seed_streams, ensemble_stats, grid_configs, grid_point, grid_table, load_ensemble,
+    load_grid, open_records, open_results, parameter_grid, parse_axis, parse_options,
+    run_ensemble, run_grid, sweep_digest
+)
+from rnse_test_suite import SimulationConfig
+
+
+# Environment variable holding the shared secret of a cluster
+AUTHKEY_ENV = "RNSE_AUTHKEY"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_LEASE_TIMEOUT = 3600.0  # Seconds before an unanswered task is re-dispatched
+HANDSHAKE_TIMEOUT = 10.0  # Seconds a new connection may take per handshake message
+
+
+class _TimedHandshake:
+    """
+    Connection wrapper for the authentication handshake whose receives
+    give up after `timeout` seconds, so a peer that connects and stalls
+    cannot hold its handler forever.
+    """
+
+    def __init__(self, conn: Connection, timeout: float):
+        self.conn = conn
+        self.timeout = timeout
+
+    def send_bytes(self, buf: bytes):
+        self.conn.send_bytes(buf)
+
+    def recv_bytes(self, maxlength: Optional[int] = None) -> bytes:
+        if not self.conn.poll(self.timeout):
+            raise multiprocessing.AuthenticationError("handshake timed out")
+        return self.conn.recv_bytes(maxlength)
+
+
+def cluster_authkey() -> bytes:
+    """
+    Shared secret from RNSE_AUTHKEY.
+
+    Raises:
+        RuntimeError: If RNSE_AUTHKEY is unset or empty
+    """
+    key = os.environ.get(AUTHKEY_ENV, "")
+    if not key:
+        raise RuntimeError(
+            f"{AUTHKEY_ENV} must be set to a shared secret on the coordinator and "
+            f"all workers (tasks and results are pickled)"
+        )
+    return key.encode("utf-8")
+
+
+class Coordinator:
+    """
+    Leases tasks to connected workers and collects their results.
+
+    Args:
+        tasks: (key, payload) pairs; keys must be unique
+        fn: Module-level function run by workers as fn(payload) -> bytes
+        sink: Called once per key with the worker's result, in the
+            coordinator process
+        address: (host, port) to listen on; port 0 picks a free port
+        authkey: Shared secret (default: cluster_authkey())
+        lease_timeout: Seconds before a leased task is handed out again
+    """
+
+    def __init__(
+        self,
+        tasks: Iterable[Tuple[Hashable, object]],
+        fn: Callable[[object], bytes],
+        sink: Callable[[Hashable, bytes], None],
+        address: Tuple[str, int] = (DEFAULT_HOST, 0),
+        authkey: Optional[bytes] = None,
+        lease_timeout: float = DEFAULT_LEASE_TIMEOUT
+    ):
+        self.fn = fn
+        self.sink = sink
+        self.authkey = authkey or cluster_authkey()
+        self.lease_timeout = lease_timeout
+        self.pending = deque(tasks)
+        self.leases: Dict[Hashable, Tuple[object, float]] = {}
+        self.done: set = set()
+        self.redispatched = 0
+
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        # No authkey here: accept() would run the handshake inline and let
+        # one stalled peer block everyone; each handler runs it instead
+        self.listener = Listener(address)
+        self.address = self.listener.address
+        if not self.pending:
+            self._finished.set()
+
+    def serve(self):
+        """Accept workers until every task has a result."""
+        try:
+            while not self._finished.is_set():
+                try:
+                    conn = self.listener.accept()
+                except OSError:
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            self.listener.close()
+
+    def _lease(self) -> Tuple:
+        with self._lock:
+            now = time.monotonic()
+            for key, (payload, deadline) in list(self.leases.items()):
+                if deadline < now:
+                    del self.leases[key]
+                    self.pending.appendleft((key, payload))
+                    self.redispatched += 1
+            if self.pending:
+                key, payload = self.pending.popleft()
+                self.leases[key] = (payload, now + self.lease_timeout)
+                return ("task", key, self.fn, payload)
+            if self.leases:
+                return ("wait", 1.0)
+            return ("done",)
+
+    def _release(self, key: Hashable):
+        # The worker holding `key` disconnected without a result
+        with self._lock:
+            if key in self.leases:
+                payload, _ = self.leases.pop(key)
+                self.pending.appendleft((key, payload))
+                self.redispatched += 1
+
+    def _complete(self, key: Hashable, result: bytes):
+        with self._lock:
+            if key in self.done:
+                return
+            self.leases.pop(key, None)
+            self.pending = deque(task for task in self.pending if task[0] != key)
+            self.sink(key, result)
+            self.done.add(key)
+            finished = not self.pending and not self.leases
+        if finished:
+            self._finished.set()
+            # Wake the blocking accept() so serve() can return
+            try:
+                socket.create_connection(self.address).close()
+            except OSError:
+                pass
+
+    def _handle(self, conn: Connection):
+        leased = None
+        try:
+            # Same exchange as an authenticated Listener.accept()
+            handshake = _TimedHandshake(conn, HANDSHAKE_TIMEOUT)
+            deliver_challenge(handshake, self.authkey)
+            answer_challenge(handshake, self.authkey)
+            while True:
+                msg = conn.recv()
+                if msg[0] == "get":
+                    reply = self._lease()
+                    leased = reply[1] if reply[0] == "task" else None
+                    conn.send(reply)
+                    if reply[0] == "done":
+                        return
+                elif msg[0] == "result":
+                    self._complete(msg[1], msg[2])
+                    leased = None
+        except (EOFError, OSError, multiprocessing.AuthenticationError):
+            pass  # Bare, stalled or unauthenticated peer, or a lost worker
+        finally:
+            if leased is not None:
+                self._release(leased)
+            conn.close()
+
+
+def run_worker(
+    address: Tuple[str, int],
+    authkey: Optional[bytes] = None,
+    crash_after: Optional[int] = None
+) -> int:
+    """
+    Fetch and run tasks until the coordinator reports completion.
+
+    Args:
+        address: Coordinator (host, port)
+        authkey: Shared secret (default: cluster_authkey())
+        crash_after: Fault injection: die abruptly on receiving this many
+            tasks, before returning the last one
+
+    Returns:
+        int: Number of tasks completed by this worker
+    """
+    authkey = authkey or cluster_authkey()
+    completed = 0
+    try:
+        conn = Client(address, authkey=authkey)
+    except OSError:
+        return completed  # Coordinator already finished
+
+    with conn:
+        try:
+            while True:
+                conn.send(("get",))
+                msg = conn.recv()
+                if msg[0] == "done":
+                    return completed
+                if msg[0] == "wait":
+                    time.sleep(msg[1])
+                    continue
+                _, key, fn, payload = msg
+                if crash_after is not None and completed + 1 >= crash_after:
+                    os._exit(1)
+                conn.send(("result", key, fn(payload)))
+                completed += 1
+        except (EOFError, OSError):
+            return completed
+
+
+def run_local_cluster(
+    coordinator: Coordinator,
+    n_workers: int,
+    crash_after: Optional[Dict[int, int]] = None
+):
+    """
+    Serve `coordinator` with local worker processes standing in for nodes.
+
+    Workers that exit abnormally are respawned (without fault injection)
+    while tasks remain, as a node restart would.
+
+    Args:
+        coordinator: Coordinator to serve
+        n_workers: Worker processes
+        crash_after: Worker index -> crash_after value for fault injection
+    """
+    crash_after = crash_after or {}
+
+    def spawn(i: int, inject: bool) -> multiprocessing.Process:
+        proc = multiprocessing.Process(
+            target=run_worker,
+            args=(coordinator.address, coordinator.authkey,
+                  crash_after.get(i) if inject else None),
+            daemon=True
+        )
+        proc.start()
+        return proc
+
+    procs = [spawn(i, True) for i in range(n_workers)]
+    stop = threading.Event()
+
+    def supervise():
+        while not stop.wait(0.2):
+            for i, proc in enumerate(procs):
+                if proc.exitcode not in (None, 0):
+                    procs[i] = spawn(i, False)
+
+    supervisor = threading.Thread(target=supervise, daemon=True)
+    supervisor.start()
+    try:
+        coordinator.serve()
+    finally:
+        stop.set()
+        supervisor.join()
+        for proc in procs:
+            proc.join(timeout=10)
+            if proc.is_alive():
+                proc.terminate()
+
+
+class RecordCoordinator(Coordinator):
+    """Coordinator appending each worker's packed record to a results file."""
+
+    def __init__(self, out, *args, **kwargs):
+        self.out = out
+        super().__init__(*args, **kwargs)
+
+    def _write(self, key: Hashable, record: bytes):
+        self.out.write(record)
+        self.out.flush()
+
+
+class EnsembleCoordinator(RecordCoordinator):
+    """
+    Coordinator for a seed ensemble writing to an ENSEMBLE_DTYPE file.
+
+    Seeds already in the file are skipped, as in run_ensemble (with the
+    same default seeding, seed-stream check and config header); close()
+    releases the file and summarizes it once serving is over.
+    """
+
+    def __init__(
+        self,
+        seeds: Iterable[int],
+        results_path: str,
+        config: Optional[SimulationConfig] = None,
+        address: Tuple[str, int] = (DEFAULT_HOST, 0),
+        authkey: Optional[bytes] = None,
+        lease_timeout: float = DEFAULT_LEASE_TIMEOUT
+    ):
+        template = config or SimulationConfig(seeding=ENSEMBLE_SEEDING)
+        seeds = list(seeds)
+        check_seed_streams(seeds, template)
+        self.results_path = results_path
+        out, done = open_results(results_path, sweep_digest(template, ("rng_seed",)))
+        tasks = [
+            (seed, dataclasses.replace(template, rng_seed=seed))
+            for seed in seeds if seed not in done
+        ]
+        super().__init__(
+            out, tasks, _ensemble_task, self._write, address, authkey, lease_timeout
+        )
+
+    def close(self) -> EnsembleStats:
+        self.out.close()
+        return ensemble_stats(load_ensemble(self.results_path))
+
+
+class GridCoordinator(RecordCoordinator):
+    """
+    Coordinator for a parameter grid writing to a GRID_DTYPE file.
+
+    Points already in the file are skipped, as in run_grid. Workers run
+    without a tick cache (it is a local directory); close() releases the
+    file and returns its records once serving is over.
+    """
+
+    def __init__(
+        self,
+        points: Iterable[Dict],
+        results_path: str,
+        config: Optional[SimulationConfig] = None,
+        address: Tuple[str, int] = (DEFAULT_HOST, 0),
+        authkey: Optional[bytes] = None,
+        lease_timeout: float = DEFAULT_LEASE_TIMEOUT
+    ):
+        self.results_path = results_path
+        digest = sweep_digest(config or SimulationConfig(), GRID_PARAMS)
+        out, done = open_records(results_path, GRID_DTYPE, grid_point, digest)
+        tasks = [
+            (key, (point_config, None))
+            for key, point_config in grid_configs(points, config).items()
+            if key not in done
+        ]
+        super().__init__(out, tasks, _grid_task, self._write, address, authkey, lease_timeout)
+
+    def close(self) -> np.ndarray:
+        self.out.close()
+        return load_grid(self.results_path)
+
+
+def verify_local_cluster(
+    results_path: str,
+    n_seeds: int = 6,
+    n_workers: int = 3,
+    n_particles: int = 1000
+) -> EnsembleStats:
+    """
+    Self-check of crash recovery on one box: a local cluster with a worker
+    that dies mid-task must produce exactly the records of a serial run.
+
+    Raises:
+        AssertionError: If records or digests differ
+    """
+    config = SimulationConfig(n_particles=n_particles)
+    seeds = range(config.rng_seed, config.rng_seed + n_seeds)
+
+    reference_path = results_path + ".serial"
+    for path in (results_path, reference_path):
+        if os.path.exists(path):
+            os.remove(path)
+    run_ensemble(seeds, reference_path, config, executor="serial")
+
+    # Local-only run: a throwaway secret instead of RNSE_AUTHKEY
+    coordinator = EnsembleCoordinator(seeds, results_path, config, authkey=os.urandom(32))
+    run_local_cluster(coordinator, n_workers, crash_after={0: 1})
+    stats = coordinator.close()
+
+    got = np.sort(load_ensemble(results_path), order="seed")
+    want = np.sort(load_ensemble(reference_path), order="seed")
+    if got.tobytes() != want.tobytes():
+        raise AssertionError("cluster records differ from the serial ensemble")
+    if coordinator.redispatched < 1:
+        raise AssertionError("crashed worker's task was not re-dispatched")
+    return stats
+
+
+def _echo_task(payload: bytes) -> bytes:
+    # Trivial task for verify_stray_connections
+    return payload
+
+
+def verify_stray_connections(n_tasks: int = 4, timeout: float = 60.0) -> int:
+    """
+    Self-check that peers which never authenticate do not stop a
+    coordinator: a bare TCP connect-and-close and a connection that
+    stalls before the handshake, both made before the only worker
+    connects, must leave every task completed.
+
+    Returns:
+        int: Tasks completed
+
+    Raises:
+        AssertionError: If serving dies or does not finish within `timeout`
+    """
+    results: Dict[Hashable, bytes] = {}
+    coordinator = Coordinator(
+        [(i, bytes([i])) for i in range(n_tasks)], _echo_task, results.__setitem__,
+        authkey=os.urandom(32)
+    )
+    server = threading.Thread(target=coordinator.serve, daemon=True)
+    server.start()
+
+    socket.create_connection(coordinator.address).close()
+    stalled = socket.create_connection(coordinator.address)
+    try:
+        completed = run_worker(coordinator.address, coordinator.authkey)
+        server.join(timeout)
+    finally:
+        stalled.close()
+    if server.is_alive():
+        raise AssertionError("coordinator did not finish serving")
+    if results != {i: bytes([i]) for i in range(n_tasks)} or completed != n_tasks:
+        raise AssertionError(f"worker completed {completed} of {n_tasks} tasks")
+    return completed
+
+
+def verify_local_grid(
+    results_path: str,
+    n_workers: int = 3,
+    n_particles: int = 1000
+) -> np.ndarray:
+    """
+    Self-check of the grid coordinator: a local cluster with a worker that
+    dies mid-task must produce exactly the records of a serial run_grid().
+
+    Raises:
+        AssertionError: If records or digests differ
+    """
+    config = SimulationConfig(n_particles=n_particles)
+    points = parameter_grid(tau=[0.2, 0.25], q=[2, 4])
+
+    reference_path = results_path + ".serial"
+    for path in (results_path, reference_path):
+        if os.path.exists(path):
+            os.remove(path)
+    run_grid(points, reference_path, config, executor="serial")
+
+    coordinator = GridCoordinator(points, results_path, config, authkey=os.urandom(32))
+    run_local_cluster(coordinator, n_workers, crash_after={0: 1})
+    records = coordinator.close()
+
+    got = np.sort(records, order=list(GRID_PARAMS))
+    want = np.sort(load_grid(reference_path), order=list(GRID_PARAMS))
+    if got.tobytes() != want.tobytes():
+        raise AssertionError("cluster records differ from the serial grid")
+    return records
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) >= 5 and argv[1] == "coordinator":
+        results_path, first, count = argv[2], int(argv[3], 0), int(argv[4])
+        host = argv[5] if len(argv) > 5 else DEFAULT_HOST
+        port = int(argv[6]) if len(argv) > 6 else 0
+        coordinator = EnsembleCoordinator(
+            range(first, first + count), results_path, address=(host, port)
+        )
+        print(f"[*] RNSE::COORDINATOR_v0.74 listening on {coordinator.address}")
+        coordinator.serve()
+        stats = coordinator.close()
+        print(f"[✓] {stats.n_seeds} seeds, median drop {stats.drop_median:.4f}%")
+        return 0
+
+    if len(argv) >= 3 and argv[1] == "grid-coordinator":
+        try:
+            options = parse_options(argv[3:], ("n", "host", "port"))
+            config = SimulationConfig(
+                n_particles=int(options.pop("n", SimulationConfig.n_particles))
+            )
+            host = options.pop("host", DEFAULT_HOST)
+            port = int(options.pop("port", 0))
+            axes = {name: parse_axis(name, spec) for name, spec in options.items()}
+        except ValueError as e:
+            print(f"{__doc__}\nerror: {e}", file=sys.stderr)
+            return 2
+        coordinator = GridCoordinator(
+            parameter_grid(**axes), argv[2], config, address=(host, port)
+        )
+        print(f"[*] RNSE::GRID_COORDINATOR_v0.74 listening on {coordinator.address}")
+        coordinator.serve()
+        records = coordinator.close()
+        print("\n[GRID]")
+        print("\n".join(grid_table(records)))
+        return 0
+
+    if len(argv) == 4 and argv[1] == "worker":
+        completed = run_worker((argv[2], int(argv[3])))
+        print(f"[✓] Worker completed {completed} tasks")
+        return 0
+
+    print(__doc__)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
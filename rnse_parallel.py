@@ -0,0 +1,164 @@
+"""
+RNSE PARALLEL EXECUTION: Worker Pools and Shared-Memory Arrays
+Version: 0.74-AUDIT
+
+Helpers for spreading deterministic work across workers. Execution
+backends (serial, thread pool, process pool or any user-provided
+concurrent.futures.Executor) are selected by name via executor_for().
+Results can be written into NumPy arrays backed by
+`multiprocessing.shared_memory`, so workers fill slices of one
+preallocated buffer instead of pickling arrays back to the parent.
+
+Author: Elad Genish
+License: MIT (core) + Proprietary (patent)
+"""
+
+import mmap
+import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+
+def default_workers() -> int:
+    """Number of CPUs available to this process."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class SharedArray:
+    """
+    NumPy array backed by a named shared-memory block.
+
+    The creating process owns the block and must `unlink()` it; workers
+    `attach()` by spec and only `close()`.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], dtype, name: Optional[str] = None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        nbytes = max(1, int(np.prod(self.shape)) * self.dtype.itemsize)
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)
+
+    def spec(self) -> Tuple[str, Tuple[int, ...], str]:
+        """Picklable (name, shape, dtype) handle for attach()."""
+        return (self.shm.name, self.shape, self.dtype.str)
+
+    @classmethod
+    def attach(cls, spec: Tuple[str, Tuple[int, ...], str]) -> "SharedArray":
+        name, shape, dtype = spec
+        return cls(shape, dtype, name=name)
+
+    def close(self):
+        """Release this process's mapping (the array view is dropped)."""
+        self.array = None
+        self.shm.close()
+
+    def unlink(self):
+        """Free the block; call once, from the owning process."""
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def release(self):
+        """Close and unlink unless already done; safe on every exit path."""
+        if self.array is not None:
+            self.close()
+            self.unlink()
+
+    def detach(self) -> np.ndarray:
+        """
+        Turn the block into a plain array owned by this process, then close
+        and unlink the shared name. Workers must be done with it.
+
+        On Linux the segment is re-mapped through /dev/shm with a shared
+        (MAP_SHARED) mapping, so no copy is made. Once the name is unlinked
+        no other process can attach, and the memory is freed with the
+        array; a worker still attached would see writes to it. Elsewhere
+        the data is copied out.
+        """
+        path = "/dev/shm/" + self.shm.name.lstrip("/")
+        count = int(np.prod(self.shape))
+        if os.path.exists(path):
+            fd = os.open(path, os.O_RDWR)
+            try:
+                mapping = mmap.mmap(fd, max(1, count * self.dtype.itemsize))
+            finally:
+                os.close(fd)
+            array = np.frombuffer(mapping, dtype=self.dtype, count=count).reshape(self.shape)
+        else:
+            array = self.array.copy()
+        self.close()
+        self.unlink()
+        return array
+
+
+# Execution backends accepted by SimulationConfig.executor (besides a
+# user-provided concurrent.futures.Executor)
+EXECUTOR_KINDS = ("serial", "threads", "processes")
+
+
+class SerialExecutor(Executor):
+    """Executor that runs every task inline, in submission order."""
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def check_executor_spec(spec: Union[str, Executor]):
+    """Raise ValueError for anything but an Executor or an EXECUTOR_KINDS name."""
+    if not isinstance(spec, Executor) and spec not in EXECUTOR_KINDS:
+        raise ValueError(
+            f"executor must be one of {EXECUTOR_KINDS} or an Executor, got {spec!r}"
+        )
+
+
+def is_serial(spec: Union[str, Executor], max_workers: int) -> bool:
+    """True when `spec` would run everything inline in this process."""
+    return not isinstance(spec, Executor) and (spec == "serial" or max_workers <= 1)
+
+
+@contextmanager
+def executor_for(
+    spec: Union[str, Executor],
+    max_workers: Optional[int] = None
+) -> Iterator[Executor]:
+    """
+    Context manager yielding the Executor described by `spec`.
+
+    Pools created here are shut down on exit; a caller-provided Executor is
+    used as-is and left running, so several runs can share one pool.
+
+    Args:
+        spec: "serial", "threads", "processes" or an Executor
+        max_workers: Pool size (default: all available CPUs)
+    """
+    check_executor_spec(spec)
+    if isinstance(spec, Executor):
+        yield spec
+        return
+
+    max_workers = max_workers or default_workers()
+    if is_serial(spec, max_workers):
+        yield SerialExecutor()
+    elif spec == "threads":
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            yield pool
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            yield pool
@@ -8,41 +8,92 @@ publication package: audit trail, results JSON, visualization, and
 publication-ready caption.
 
 Run this ONCE. It produces everything you need to publish.
+
+To rebuild the bundle files from a saved results.json without importing
+NumPy or the engine:
+
+    python rnse_publish.py --from-results rnse_publication_package/results.json
+
+`--output-dir <dir>` writes the bundle elsewhere; any other argument is
+rejected with exit status 2.
 """
 
 import json
 import sys
 from datetime import datetime
-import hashlib
 from pathlib import Path
+from typing import Dict, List, Optional
+
+# Light import only: the test suite (NumPy + rnse_core) is imported on
+# demand, when a fresh run is actually needed.
+from rnse_caption import generate_publication_caption
+
 
-# Import the test suite
-from rnse_test_suite import run_full_suite, AuditLog, AuditMetadata
+# Default location of the generated bundle
+DEFAULT_OUTPUT_DIR = "./rnse_publication_package"
 
 
-def create_publication_bundle():
+def print_banner():
+    """Console banner of the bundle generator."""
+    print("\n" + "="*80)
+    print(" RNSE v0.74 PUBLICATION PACKAGE GENERATOR")
+    print(" Complete Audit-Grade Evidence Bundle")
+    print("="*80 + "\n")
+
+
+def load_results(results_file: str) -> dict:
+    """Load a saved results.json, regenerating its caption."""
+    with open(results_file) as f:
+        results_package = json.load(f)
+    results_package["publication_caption"] = generate_publication_caption(
+        results_package["rotation_curve"]
+    )
+    return results_package
+
+
+def create_publication_bundle(
+    results_file: Optional[str] = None,
+    output_dir: str = DEFAULT_OUTPUT_DIR
+):
     """
     Generate the complete publication bundle.
     Saves:
     - results.json (audit trail + metrics)
     - publication_caption.txt (LinkedIn ready)
     - verification_hash.txt (for reproducibility verification)
+    
+    Args:
+        results_file: Rebuild from this saved results.json instead of
+            running the suite (the engine is never imported)
+        output_dir: Bundle directory
     """
     
-    print("\n" + "="*80)
-    print(" RNSE v0.74 PUBLICATION PACKAGE GENERATOR")
-    print(" Complete Audit-Grade Evidence Bundle")
-    print("="*80 + "\n")
+    print_banner()
+    
+    # 1. Run the full test suite (or load saved results)
+    if results_file is not None:
+        print(f"[1/4] Loading saved results from {results_file}...")
+        results_package = load_results(results_file)
+    else:
+        print("[1/4] Running full test suite...")
+        from rnse_test_suite import run_full_suite
+        results_package = run_full_suite()
     
-    # 1. Run the full test suite
-    print("[1/4] Running full test suite...")
-    results_package = run_full_suite()
+    return write_bundle(results_package, output_dir)
+
+
+def write_bundle(results_package: dict, output_dir: str = DEFAULT_OUTPUT_DIR) -> Path:
+    """
+    Write the bundle files for a results package (steps 2-4 and summary).
     
+    Returns:
+        Path: The bundle directory
+    """
     # 2. Generate publication materials
     print("\n[2/4] Generating publication materials...")
     
     # Create output directory
-    output_dir = Path("./rnse_publication_package")
+    output_dir = Path(output_dir)
     output_dir.mkdir(exist_ok=True)
     
     # Save full results
@@ -252,11 +303,47 @@ Good luck.
     return output_dir
 
 
-if __name__ == "__main__":
+# Command line of this script
+USAGE = "usage: python rnse_publish.py [--from-results <results.json>] [--output-dir <dir>]"
+
+
+def parse_args(argv: List[str]) -> Dict[str, str]:
+    """
+    Options of the command line (without the program name).
+
+    Raises:
+        ValueError: On an unrecognized argument or a missing value
+    """
+    options = {}
+    args = iter(argv)
+    for arg in args:
+        name, sep, value = arg.partition("=")
+        if name not in ("--from-results", "--output-dir") or name in options:
+            raise ValueError(f"unrecognized argument {arg!r}")
+        value = value if sep else next(args, "")
+        if not value:
+            raise ValueError(f"{name} needs a value")
+        options[name] = value
+    return options
+
+
+def main(argv: List[str]) -> int:
     try:
-        package_dir = create_publication_bundle()
+        options = parse_args(argv[1:])
+    except ValueError as e:
+        print(f"{USAGE}\nerror: {e}", file=sys.stderr)
+        return 2
+    try:
+        create_publication_bundle(
+            options.get("--from-results"),
+            options.get("--output-dir", DEFAULT_OUTPUT_DIR)
+        )
         print(f"\n✅ READY TO PUBLISH\n")
-        sys.exit(0)
+        return 0
     except Exception as e:
         print(f"\n❌ ERROR: {e}\n")
-        sys.exit(1)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,609 @@
+"""
+RNSE RESAMPLING: Bootstrap Intervals and Permutation Tests for the Rotation Curve
+Version: 0.74-AUDIT
+
+Percentile bootstrap of the inner/outer split: particles are resampled
+with replacement, the median radius is recomputed per resample, and the
+inner velocity, outer velocity and velocity drop are collected into
+confidence intervals.
+
+Permutation test of the velocity drop: the radius-velocity pairing is
+shuffled, which keeps the median and the inner/outer membership fixed,
+and the drop of each shuffle forms the null distribution. The p-value is
+the exact Monte Carlo p-value (1 + #{null as extreme}) / (1 + B).
+
+Resamples are evaluated in vectorized blocks without a Python loop per
+resample. Particles are sorted by radius once; a block of B resamples is
+a (B, N) matrix of multiplicities (one np.bincount), whose cumulative
+counts along the sorted particles locate every resample's median at
+once; inner/outer speed sums are matrix-vector products. Blocks are
+sized to a fixed memory budget. When even one (1, N) row exceeds it,
+each draw is built in particle chunks instead: the multiplicities are
+accumulated chunk by chunk with np.add.at, and the median and speed sums
+are taken from them chunk by chunk, leaving an (N,) count vector as the
+only full-size array.
+
+Permutations are drawn the same way, a (B, N) block at a time: each row
+is a random partition of the speeds into the inner region, the median
+particles and the outer region (one np.argpartition of random keys),
+which is all the drop statistic needs of a shuffle. Above the budget a
+shuffle is dealt chunk by chunk: the inner, median and outer slots of a
+chunk are multivariate hypergeometric in those still unfilled, and a
+permutation of the chunk fills them.
+
+Each block draws from its own PCG64 stream, `PCG64(seed).jumped(block)`,
+so results depend only on the seed and the resample count, not on the
+backend or the number of workers; blocks are independent, so runtime
+scales with the number of workers. Blocks are spread over any
+executor spec (serial, threads, processes or an Executor); process
+workers read the sorted particles from shared memory.
+
+Author: Elad Genish
+License: MIT (core) + Proprietary (patent)
+"""
+
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from rnse_parallel import SharedArray, default_workers, executor_for, is_serial
+
+
+# Metrics with bootstrap intervals, as named in RotationCurveResult
+BOOTSTRAP_METRICS = ("velocity_drop_percent", "inner_velocity", "outer_velocity")
+
+DEFAULT_RESAMPLES = 2000
+DEFAULT_LEVEL = 0.95
+DEFAULT_PERMUTATIONS = 9999
+
+# Alternatives of permutation_test(), on the velocity drop
+ALTERNATIVES = ("two-sided", "greater", "less")
+
+# First block index of permutation streams, so that a permutation test and
+# a bootstrap with the same seed never share random draws
+PERMUTATION_BLOCKS = 1 << 32
+
+# Relative tolerance for null statistics tying with the observed one
+# (the same value summed in a different order)
+TIE_RTOL = 1e-12
+
+# Resamples per block at most, and the working-set budget of one block
+MAX_BLOCK_RESAMPLES = 256
+BLOCK_BUDGET_MIB = 64
+
+
+def block_size(n: int, budget_mib: int = BLOCK_BUDGET_MIB) -> int:
+    """Resamples per block for `n` particles (four (B, n) 8-byte temporaries)."""
+    return int(max(1, min(MAX_BLOCK_RESAMPLES, budget_mib * 2**20 // (32 * max(n, 1)))))
+
+
+def particle_chunk(n: int, budget_mib: int = BLOCK_BUDGET_MIB) -> int:
+    """Particles per step of one draw within the budget (n if a whole row fits)."""
+    return int(max(1, min(n, budget_mib * 2**20 // 32)))
+
+
+def block_rng(seed: int, block: int) -> np.random.Generator:
+    """Generator of one block: PCG64(seed) jumped ahead `block` times."""
+    return np.random.Generator(np.random.PCG64(seed).jumped(block))
+
+
+def split_stats(
+    r_sorted: np.ndarray,
+    v_sorted: np.ndarray,
+    counts: np.ndarray
+) -> np.ndarray:
+    """
+    Inner/outer split of weighted particle sets.
+
+    Args:
+        r_sorted: (N,) radii in ascending order
+        v_sorted: (N,) speeds in the same order
+        counts: (B, N) multiplicity of each particle in each of B sets
+
+    Returns:
+        np.ndarray: (B, 3) velocity drop, inner and outer velocity per set,
+            with the split at each set's own median radius (as np.median)
+    """
+    counts = counts.astype(np.float64, copy=False)
+    n_sets = len(counts)
+    rows = np.arange(n_sets)
+    cum_count = np.cumsum(counts, axis=1)
+    total = cum_count[0, -1]
+
+    # Positions of the lower and upper middle order statistics
+    lower = (cum_count <= (total - 1) // 2).sum(axis=1)
+    upper = (cum_count <= total // 2).sum(axis=1)
+    median = (r_sorted[lower] + r_sorted[upper]) / 2.0
+
+    # Inner: r < median, outer: r > median
+    inner_end = np.searchsorted(r_sorted, median, side="left")
+    outer_start = np.searchsorted(r_sorted, median, side="right")
+
+    def prefix_count(end: np.ndarray) -> np.ndarray:
+        return np.where(end > 0, cum_count[rows, np.maximum(end - 1, 0)], 0.0)
+
+    # Speed sums: one matrix-vector product up to the first split, plus
+    # the narrow band of columns where the splits of the sets differ
+    lo, hi = int(inner_end.min()), int(outer_start.max())
+    base = counts[:, :lo] @ v_sorted[:lo]
+    band = counts[:, lo:hi] * v_sorted[lo:hi]
+    cols = np.arange(lo, hi)
+    inner_sum = base + np.where(cols < inner_end[:, None], band, 0.0).sum(axis=1)
+    before_outer = base + np.where(cols < outer_start[:, None], band, 0.0).sum(axis=1)
+    outer_sum = counts @ v_sorted - before_outer
+
+    inner_v = inner_sum / prefix_count(inner_end)
+    outer_v = outer_sum / (total - prefix_count(outer_start))
+    drop = np.where(inner_v > 0, 100.0 * (1.0 - outer_v / inner_v), 0.0)
+    return np.stack([drop, inner_v, outer_v], axis=1)
+
+
+def bootstrap_block(
+    r_sorted: np.ndarray,
+    v_sorted: np.ndarray,
+    rng: np.random.Generator,
+    n_resamples: int
+) -> np.ndarray:
+    """(n_resamples, 3) bootstrap replicates of split_stats()."""
+    n = len(r_sorted)
+    step = particle_chunk(n)
+    if step < n:
+        return np.stack([
+            row_split_stats(r_sorted, v_sorted, row_counts(n, rng, step), step)
+            for _ in range(n_resamples)
+        ])
+    draws = rng.integers(0, n, size=(n_resamples, n))
+    draws += (np.arange(n_resamples) * n)[:, None]
+    counts = np.bincount(draws.ravel(), minlength=n_resamples * n).reshape(n_resamples, n)
+    del draws
+    return split_stats(r_sorted, v_sorted, counts)
+
+
+def row_counts(n: int, rng: np.random.Generator, step: int) -> np.ndarray:
+    """(N,) multiplicities of one resample of n particles, drawn `step` at a time."""
+    counts = np.zeros(n, dtype=np.int64)
+    for start in range(0, n, step):
+        np.add.at(counts, rng.integers(0, n, size=min(step, n - start)), 1)
+    return counts
+
+
+def row_split_stats(
+    r_sorted: np.ndarray,
+    v_sorted: np.ndarray,
+    counts: np.ndarray,
+    step: int
+) -> np.ndarray:
+    """
+    split_stats() of a single (N,) multiplicity vector, `step` particles
+    at a time.
+
+    Returns:
+        np.ndarray: (3,) velocity drop, inner and outer velocity
+    """
+    n = len(r_sorted)
+    total = int(counts.sum())
+
+    # Positions of the lower and upper middle order statistics
+    lower = upper = seen = 0
+    for start in range(0, n, step):
+        cum_count = seen + np.cumsum(counts[start:start + step], dtype=np.int64)
+        lower += int(np.count_nonzero(cum_count <= (total - 1) // 2))
+        upper += int(np.count_nonzero(cum_count <= total // 2))
+        seen = int(cum_count[-1])
+    median = (r_sorted[lower] + r_sorted[upper]) / 2.0
+    inner_end = int(np.searchsorted(r_sorted, median, side="left"))
+    outer_start = int(np.searchsorted(r_sorted, median, side="right"))
+
+    def weighted(begin: int, end: int) -> Tuple[int, float]:
+        # (particles, speed sum) of the resample in sorted columns [begin, end)
+        count, total_v = 0, 0.0
+        for start in range(begin, end, step):
+            stop = min(end, start + step)
+            count += int(counts[start:stop].sum())
+            total_v += float(counts[start:stop].astype(np.float64) @ v_sorted[start:stop])
+        return count, total_v
+
+    inner_n, inner_sum = weighted(0, inner_end)
+    outer_n, outer_sum = weighted(outer_start, n)
+    inner_v, outer_v = inner_sum / inner_n, outer_sum / outer_n
+    drop = 100.0 * (1.0 - outer_v / inner_v) if inner_v > 0 else 0.0
+    return np.array([drop, inner_v, outer_v])
+
+
+def split_drop(values: np.ndarray, inner_end: int, outer_start: int) -> np.ndarray:
+    """
+    Velocity drop of each row of (B, N) speeds ordered by radius, with the
+    inner region the first `inner_end` and the outer region the columns
+    from `outer_start` on.
+    """
+    inner = values[:, :inner_end].sum(axis=1) / inner_end
+    outer = values[:, outer_start:].sum(axis=1) / (values.shape[1] - outer_start)
+    return np.where(inner > 0, 100.0 * (1.0 - outer / inner), 0.0)
+
+
+def median_split_columns(r_sorted: np.ndarray) -> Tuple[int, int]:
+    """(inner end, outer start) of the split at the median of sorted radii."""
+    n = len(r_sorted)
+    median = (r_sorted[(n - 1) // 2] + r_sorted[n // 2]) / 2.0
+    return (
+        int(np.searchsorted(r_sorted, median, side="left")),
+        int(np.searchsorted(r_sorted, median, side="right"))
+    )
+
+
+def permutation_block(
+    r_sorted: np.ndarray,
+    v_sorted: np.ndarray,
+    rng: np.random.Generator,
+    n_permutations: int
+) -> np.ndarray:
+    """(n_permutations,) velocity drops with the speeds shuffled over the radii."""
+    n = len(v_sorted)
+    inner_end, outer_start = median_split_columns(r_sorted)
+    step = particle_chunk(n)
+    if step < n:
+        return np.array([
+            permutation_row(v_sorted, inner_end, outer_start, rng, step)
+            for _ in range(n_permutations)
+        ])
+
+    # A uniform shuffle ranks the speeds by i.i.d. random keys: the inner
+    # region receives the speeds with the inner_end smallest keys, the
+    # particles at the median the next ones and the outer region the rest,
+    # so one partition per row replaces a full shuffle
+    keys = rng.random((n_permutations, n))
+    order = np.argpartition(keys, inner_end - 1, axis=1)
+    inner_sum = v_sorted[order[:, :inner_end]].sum(axis=1)
+    skipped_sum = 0.0
+    if outer_start > inner_end:
+        rest = order[:, inner_end:]
+        rows = np.arange(n_permutations)[:, None]
+        skipped = np.argpartition(keys[rows, rest], outer_start - inner_end - 1, axis=1)
+        skipped_sum = v_sorted[rest[rows, skipped[:, :outer_start - inner_end]]].sum(axis=1)
+    outer_sum = v_sorted.sum() - inner_sum - skipped_sum
+
+    inner = inner_sum / inner_end
+    outer = outer_sum / (n - outer_start)
+    return np.where(inner > 0, 100.0 * (1.0 - outer / inner), 0.0)
+
+
+def permutation_row(
+    v_sorted: np.ndarray,
+    inner_end: int,
+    outer_start: int,
+    rng: np.random.Generator,
+    step: int
+) -> float:
+    """Velocity drop of one shuffle, dealt `step` speeds at a time."""
+    n = len(v_sorted)
+    # Unfilled inner, median and outer slots
+    slots = np.array([inner_end, outer_start - inner_end, n - outer_start])
+    inner_sum = outer_sum = 0.0
+    for start in range(0, n, step):
+        chunk = rng.permutation(v_sorted[start:start + step])
+        inner, median, _ = rng.multivariate_hypergeometric(slots, len(chunk))
+        slots -= (inner, median, len(chunk) - inner - median)
+        inner_sum += float(chunk[:inner].sum())
+        outer_sum += float(chunk[inner + median:].sum())
+    inner_v = inner_sum / inner_end
+    outer_v = outer_sum / (n - outer_start)
+    return 100.0 * (1.0 - outer_v / inner_v) if inner_v > 0 else 0.0
+
+
+# Block kernels runnable on pool workers, by name
+BLOCK_KERNELS = {"bootstrap": bootstrap_block, "permutation": permutation_block}
+
+
+def shared_block(task) -> np.ndarray:
+    """
+    Pool worker: one block of draws over particles in shared memory.
+
+    Args:
+        task: (kernel name in BLOCK_KERNELS, radius SharedArray spec,
+            speed SharedArray spec, seed, block index, draws in the block),
+            the particles sorted by radius
+    """
+    kernel, r_spec, v_spec, seed, block, size = task
+    r = SharedArray.attach(r_spec)
+    v = SharedArray.attach(v_spec)
+    try:
+        return BLOCK_KERNELS[kernel](r.array, v.array, block_rng(seed, block), size)
+    finally:
+        r.close()
+        v.close()
+
+
+def block_plan(n: int, n_draws: int, first_block: int = 0) -> List[Tuple[int, int]]:
+    """(block index, draws) of every block of `n_draws` draws over `n` particles."""
+    step = block_size(n)
+    return [
+        (first_block + index, min(step, n_draws - start))
+        for index, start in enumerate(range(0, n_draws, step))
+    ]
+
+
+def sort_by_radius(r: np.ndarray, v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Radii and speeds in ascending (stable) radius order, as the kernels expect."""
+    order = np.argsort(r, kind="stable")
+    return r[order], v[order]
+
+
+def run_blocks(
+    kernel: str,
+    r_sorted: np.ndarray,
+    v_sorted: np.ndarray,
+    n_draws: int,
+    seed: int,
+    first_block: int = 0,
+    executor: Union[str, Executor] = "serial",
+    max_workers: Optional[int] = None
+) -> np.ndarray:
+    """
+    Run `n_draws` draws of a BLOCK_KERNELS kernel in blocks of
+    block_size(N), block k seeded with block_rng(seed, first_block + k),
+    and concatenate the results in block order.
+    """
+    blocks = block_plan(len(r_sorted), n_draws, first_block)
+    max_workers = max_workers or default_workers()
+
+    if is_serial(executor, max_workers):
+        parts = [
+            BLOCK_KERNELS[kernel](r_sorted, v_sorted, block_rng(seed, block), size)
+            for block, size in blocks
+        ]
+        return np.concatenate(parts)
+
+    shared_r = SharedArray(r_sorted.shape, np.float64)
+    shared_v = None
+    try:
+        shared_v = SharedArray(v_sorted.shape, np.float64)
+        shared_r.array[:] = r_sorted
+        shared_v.array[:] = v_sorted
+        tasks = [
+            (kernel, shared_r.spec(), shared_v.spec(), seed, block, size)
+            for block, size in blocks
+        ]
+        with executor_for(executor, max_workers) as pool:
+            parts: List[np.ndarray] = list(pool.map(shared_block, tasks))
+    finally:
+        shared_r.release()
+        if shared_v is not None:
+            shared_v.release()
+    return np.concatenate(parts)
+
+
+@dataclass
+class BootstrapCI:
+    """Percentile bootstrap intervals of the rotation curve metrics."""
+    level: float
+    n_resamples: int
+    seed: int
+    low: Dict[str, float]
+    high: Dict[str, float]
+    std_error: Dict[str, float]
+
+    def interval(self, metric: str) -> Tuple[float, float]:
+        return self.low[metric], self.high[metric]
+
+    def to_dict(self) -> Dict:
+        return {
+            "level": self.level,
+            "n_resamples": self.n_resamples,
+            "seed": self.seed,
+            "intervals": {
+                metric: {
+                    "low": self.low[metric],
+                    "high": self.high[metric],
+                    "std_error": self.std_error[metric]
+                }
+                for metric in BOOTSTRAP_METRICS
+            }
+        }
+
+
+def bootstrap_replicates(
+    r: np.ndarray,
+    v: np.ndarray,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    seed: int = 0,
+    executor: Union[str, Executor] = "serial",
+    max_workers: Optional[int] = None
+) -> np.ndarray:
+    """
+    Bootstrap replicates of (velocity drop, inner, outer velocity).
+
+    Args:
+        r: (N,) particle radii
+        v: (N,) particle speeds
+        n_resamples: Number of resamples
+        seed: Root seed of the per-block PCG64 streams
+        executor: Backend spec for the blocks, as for SimulationConfig.executor
+        max_workers: Pool size (default: all available CPUs)
+
+    Returns:
+        np.ndarray: (n_resamples, 3), identical for every backend
+    """
+    r_sorted, v_sorted = sort_by_radius(r, v)
+    return run_blocks(
+        "bootstrap", r_sorted, v_sorted, n_resamples, seed,
+        executor=executor, max_workers=max_workers
+    )
+
+
+def bootstrap_ci(
+    r: np.ndarray,
+    v: np.ndarray,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    level: float = DEFAULT_LEVEL,
+    seed: int = 0,
+    executor: Union[str, Executor] = "serial",
+    max_workers: Optional[int] = None
+) -> BootstrapCI:
+    """
+    Percentile bootstrap intervals of the velocity drop and the inner and
+    outer velocities (see bootstrap_replicates() for the arguments).
+
+    Raises:
+        ValueError: For a non-positive resample count or a level outside (0, 1)
+    """
+    if n_resamples <= 0:
+        raise ValueError(f"n_resamples must be positive, got {n_resamples}")
+    if not 0.0 < level < 1.0:
+        raise ValueError(f"level must be in (0, 1), got {level}")
+    replicates = bootstrap_replicates(r, v, n_resamples, seed, executor, max_workers)
+    return summarize_bootstrap(replicates, level, seed)
+
+
+def summarize_bootstrap(replicates: np.ndarray, level: float, seed: int) -> BootstrapCI:
+    """Percentile intervals of (n_resamples, 3) bootstrap replicates."""
+    n_resamples = len(replicates)
+    tail = 100.0 * (1.0 - level) / 2.0
+    low, high = np.percentile(replicates, [tail, 100.0 - tail], axis=0)
+    std_error = np.std(replicates, axis=0, ddof=1) if n_resamples > 1 else np.zeros(3)
+    return BootstrapCI(
+        level=level,
+        n_resamples=n_resamples,
+        seed=seed,
+        low={m: float(x) for m, x in zip(BOOTSTRAP_METRICS, low)},
+        high={m: float(x) for m, x in zip(BOOTSTRAP_METRICS, high)},
+        std_error={m: float(x) for m, x in zip(BOOTSTRAP_METRICS, std_error)}
+    )
+
+
+@dataclass
+class PermutationTest:
+    """Permutation test of the velocity drop against a shuffled radius-velocity pairing."""
+    observed: float
+    p_value: float
+    n_permutations: int
+    alternative: str
+    seed: int
+    null_mean: float
+    null_std: float
+
+    def to_dict(self) -> Dict:
+        return {
+            "statistic": "velocity_drop_percent",
+            "observed": self.observed,
+            "p_value": self.p_value,
+            "n_permutations": self.n_permutations,
+            "alternative": self.alternative,
+            "seed": self.seed,
+            "null_mean": self.null_mean,
+            "null_std": self.null_std
+        }
+
+
+def permutation_test(
+    r: np.ndarray,
+    v: np.ndarray,
+    n_permutations: int = DEFAULT_PERMUTATIONS,
+    alternative: str = "two-sided",
+    seed: int = 0,
+    executor: Union[str, Executor] = "serial",
+    max_workers: Optional[int] = None
+) -> PermutationTest:
+    """
+    Permutation test of the velocity drop.
+
+    Null hypothesis: speeds are exchangeable across radii. The p-value
+    counts permutations whose drop is at least as extreme as the observed
+    one ("greater": at least as large, "less": at most as large,
+    "two-sided": at least as large in magnitude), plus the observed
+    pairing itself.
+
+    Args:
+        r: (N,) particle radii
+        v: (N,) particle speeds
+        n_permutations: Number of random permutations
+        alternative: "two-sided", "greater" or "less"
+        seed: Root seed of the per-block PCG64 streams
+        executor: Backend spec for the blocks, as for SimulationConfig.executor
+        max_workers: Pool size (default: all available CPUs)
+
+    Returns:
+        PermutationTest: Identical for every backend
+
+    Raises:
+        ValueError: For a non-positive permutation count or an unknown alternative
+    """
+    if n_permutations <= 0:
+        raise ValueError(f"n_permutations must be positive, got {n_permutations}")
+    if alternative not in ALTERNATIVES:
+        raise ValueError(f"alternative must be one of {ALTERNATIVES}, got {alternative!r}")
+    r_sorted, v_sorted = sort_by_radius(r, v)
+    null = run_blocks(
+        "permutation", r_sorted, v_sorted, n_permutations, seed,
+        first_block=PERMUTATION_BLOCKS, executor=executor, max_workers=max_workers
+    )
+    return summarize_permutations(r_sorted, v_sorted, null, alternative, seed)
+
+
+def summarize_permutations(
+    r_sorted: np.ndarray,
+    v_sorted: np.ndarray,
+    null: np.ndarray,
+    alternative: str,
+    seed: int
+) -> PermutationTest:
+    """Observed drop and p-value of sorted particles against their null drops."""
+    n_permutations = len(null)
+    observed = float(split_drop(v_sorted[None, :], *median_split_columns(r_sorted))[0])
+    tol = TIE_RTOL * abs(observed)
+    if alternative == "greater":
+        extreme = null >= observed - tol
+    elif alternative == "less":
+        extreme = null <= observed + tol
+    else:
+        extreme = np.abs(null) >= abs(observed) - tol
+    return PermutationTest(
+        observed=observed,
+        p_value=float((1 + np.count_nonzero(extreme)) / (1 + n_permutations)),
+        n_permutations=n_permutations,
+        alternative=alternative,
+        seed=seed,
+        null_mean=float(np.mean(null)),
+        null_std=float(np.std(null))
+    )
+
+
+def verify_split_stats(n: int = 501, seed: int = 7, step: int = 37, n_shuffles: int = 2000) -> bool:
+    """
+    Self-check: split_stats() on unit multiplicities, and on the
+    multiplicities of an explicit resample, must match the masking
+    analysis of the expanded particle set, and so must the chunked
+    row_split_stats() with `step` particles per chunk. The null drops of
+    permutation_row() and permutation_block() must agree in mean to
+    within four standard errors.
+
+    Raises:
+        AssertionError: On any mismatch
+    """
+    rng = np.random.default_rng(seed)
+    r = np.sort(rng.random(n) * 100.0)
+    v = 3.0 + rng.random(n)
+    for idx in (np.arange(n), rng.integers(0, n, n), rng.integers(0, n, n + 1)):
+        rr, vv = r[idx], v[idx]
+        median = np.median(rr)
+        inner = np.mean(vv[rr < median])
+        outer = np.mean(vv[rr > median])
+        expected = (100.0 * (1.0 - outer / inner), inner, outer)
+        counts = np.bincount(idx, minlength=n)[None, :]
+        got = split_stats(r, v, counts)[0]
+        if not np.allclose(got, expected, rtol=1e-10, atol=0.0):
+            raise AssertionError(f"split_stats {tuple(got)} != {expected}")
+        chunked = row_split_stats(r, v, counts[0], step)
+        if not np.allclose(chunked, expected, rtol=1e-10, atol=0.0):
+            raise AssertionError(f"row_split_stats {tuple(chunked)} != {expected}")
+
+    inner_end, outer_start = median_split_columns(r)
+    rows = np.array([
+        permutation_row(v, inner_end, outer_start, rng, step) for _ in range(n_shuffles)
+    ])
+    blocks = permutation_block(r, v, rng, n_shuffles)
+    std_error = np.sqrt((rows.var() + blocks.var()) / n_shuffles)
+    if abs(rows.mean() - blocks.mean()) > 4.0 * std_error:
+        raise AssertionError(f"chunked null mean {rows.mean()} != {blocks.mean()}")
+    return True
@@ -0,0 +1,735 @@
+"""
+RNSE STATISTICS: Radial Rotation Curve Profiles and Region Moments
+Version: 0.74-AUDIT
+
+Builds the rotation curve as K radial bins of particle speed (count,
+mean, dispersion and radius range per bin) with linear, logarithmic or
+equal-count bin edges. The classic inner/outer split at the median radius
+is the special case median_split().
+
+Two interchangeable methods:
+    "sort"      Stable radix sort of particles by bin (O(N) for bin
+                indices), then per-bin reductions over contiguous slices.
+                Each bin sees its particles in the original order, so
+                means and dispersions are bit-identical to masking.
+    "bincount"  One np.bincount pass per moment, no sort. Faster and
+                lighter on memory; sums are accumulated sequentially, so
+                results agree with "sort" to ~1e-12 relative.
+
+split_moments() is a fused alternative for the inner/outer split alone:
+one chunked pass accumulating count, sum, sum of squares and radius
+range per region, with O(chunk) temporaries instead of full-size masks
+and gathers. Sums are shifted by a reference speed before squaring, so
+the dispersion does not suffer from cancellation. Means and dispersions
+agree with the masking path to ~1e-12 relative (summation order
+differs); counts and radius extrema are exact.
+
+For coordinates that arrive chunk by chunk, the split also runs in
+O(chunk) memory without the (N, 3) array. iter_speeds() reproduces the
+np.gradient speeds across chunk boundaries. A RadialSketch (log-bucket
+quantiles with Welford speed moments per bucket) gives the median to a
+relative accuracy alpha and an approximate split in one pass; a second
+pass (SplitPass) that only buffers the particles of the median buckets
+makes median, counts and radius extrema exact. Every accumulator merges,
+so disjoint spans (span_speeds()) can be reduced on separate workers.
+
+Author: Elad Genish
+License: MIT (core) + Proprietary (patent)
+"""
+
+import dataclasses
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from rnse_parallel import default_workers, executor_for, is_serial
+from rnse_ticks import DEFAULT_CHUNK_TICKS
+
+
+BIN_SCHEMES = ("linear", "log", "equal_count")
+PROFILE_METHODS = ("sort", "bincount")
+
+
+@dataclass
+class RadialProfile:
+    """Speed statistics in K radial bins; bin k spans edges[k]..edges[k+1]."""
+    scheme: str
+    edges: np.ndarray   # (K + 1,)
+    count: np.ndarray   # (K,) particles per bin
+    mean: np.ndarray    # (K,) mean speed (NaN for empty bins)
+    std: np.ndarray     # (K,) speed dispersion (NaN for empty bins)
+    r_min: np.ndarray   # (K,) smallest radius in the bin (NaN if empty)
+    r_max: np.ndarray   # (K,) largest radius in the bin (NaN if empty)
+
+    @property
+    def n_bins(self) -> int:
+        return len(self.count)
+
+    def to_dict(self) -> Dict:
+        """JSON-ready form; empty-bin statistics become None."""
+        def floats(values):
+            return [None if np.isnan(v) else float(v) for v in values]
+        return {
+            "scheme": self.scheme,
+            "edges": [float(e) for e in self.edges],
+            "count": [int(c) for c in self.count],
+            "mean": floats(self.mean),
+            "std": floats(self.std),
+            "r_min": floats(self.r_min),
+            "r_max": floats(self.r_max)
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> "RadialProfile":
+        def floats(values):
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        return cls(
+            scheme=d["scheme"],
+            edges=np.asarray(d["edges"], dtype=np.float64),
+            count=np.asarray(d["count"], dtype=np.int64),
+            mean=floats(d["mean"]),
+            std=floats(d["std"]),
+            r_min=floats(d["r_min"]),
+            r_max=floats(d["r_max"])
+        )
+
+
+def bin_edges(r: np.ndarray, n_bins: int, scheme: str = "linear") -> np.ndarray:
+    """
+    K + 1 bin edges spanning the radii `r`.
+
+    Args:
+        r: Particle radii
+        n_bins: Number of bins K
+        scheme: "linear", "log" (from the smallest positive radius) or
+            "equal_count" (radius quantiles)
+
+    Raises:
+        ValueError: For an unknown scheme or n_bins < 1
+    """
+    if n_bins < 1:
+        raise ValueError(f"n_bins must be at least 1, got {n_bins}")
+    if scheme == "linear":
+        return np.linspace(r.min(), r.max(), n_bins + 1)
+    if scheme == "log":
+        positive = r[r > 0]
+        lo = positive.min() if len(positive) else 1.0
+        return np.geomspace(lo, max(r.max(), lo), n_bins + 1)
+    if scheme == "equal_count":
+        return np.quantile(r, np.linspace(0.0, 1.0, n_bins + 1))
+    raise ValueError(f"scheme must be one of {BIN_SCHEMES}, got {scheme!r}")
+
+
+def bin_index(r: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Bin of every radius: edges[k] <= r < edges[k + 1], the last bin closed.
+    Radii outside the edges go to the nearest end bin.
+    """
+    n_bins = len(edges) - 1
+    idx = np.searchsorted(edges, r, side="right") - 1
+    np.clip(idx, 0, n_bins - 1, out=idx)
+    # Small integer types sort with a linear-time radix sort
+    return idx.astype(np.min_scalar_type(max(n_bins - 1, 0)), copy=False)
+
+
+def profile_from_edges(
+    r: np.ndarray,
+    v: np.ndarray,
+    edges: np.ndarray,
+    scheme: str = "custom",
+    method: str = "sort"
+) -> RadialProfile:
+    """
+    Speed profile of particles with radii `r` and speeds `v` in the bins
+    given by `edges` (see bin_index()).
+
+    Args:
+        method: "sort" (bit-identical to masking) or "bincount" (single
+            pass per moment, ~1e-12 relative); see the module docstring
+    """
+    n_bins = len(edges) - 1
+    idx = bin_index(r, edges)
+    count = np.bincount(idx, minlength=n_bins)
+    mean = np.full(n_bins, np.nan)
+    std = np.full(n_bins, np.nan)
+    r_min = np.full(n_bins, np.nan)
+    r_max = np.full(n_bins, np.nan)
+    filled = count > 0
+
+    if method == "sort":
+        order = np.argsort(idx, kind="stable")
+        v_sorted = v[order]
+        r_sorted = r[order]
+        del order
+        bounds = np.concatenate(([0], np.cumsum(count)))
+        for k in np.flatnonzero(filled):
+            seg = slice(bounds[k], bounds[k + 1])
+            mean[k] = np.mean(v_sorted[seg])
+            std[k] = np.std(v_sorted[seg])
+            r_min[k] = np.min(r_sorted[seg])
+            r_max[k] = np.max(r_sorted[seg])
+    elif method == "bincount":
+        sums = np.bincount(idx, weights=v, minlength=n_bins)
+        mean[filled] = sums[filled] / count[filled]
+        # Two-pass dispersion: squared deviations from the bin mean
+        dev = v - mean[idx]
+        np.square(dev, out=dev)
+        var = np.bincount(idx, weights=dev, minlength=n_bins)
+        std[filled] = np.sqrt(var[filled] / count[filled])
+        lo = np.full(n_bins, np.inf)
+        hi = np.full(n_bins, -np.inf)
+        np.minimum.at(lo, idx, r)
+        np.maximum.at(hi, idx, r)
+        r_min[filled] = lo[filled]
+        r_max[filled] = hi[filled]
+    else:
+        raise ValueError(f"method must be one of {PROFILE_METHODS}, got {method!r}")
+
+    return RadialProfile(scheme, np.asarray(edges, dtype=np.float64), count, mean, std, r_min, r_max)
+
+
+def radial_profile(
+    r: np.ndarray,
+    v: np.ndarray,
+    n_bins: int = 16,
+    scheme: str = "linear",
+    method: str = "sort"
+) -> RadialProfile:
+    """
+    Rotation curve of `n_bins` radial bins.
+
+    Args:
+        r: (N,) particle radii
+        v: (N,) particle speeds
+        n_bins: Number of bins K
+        scheme: "linear", "log" or "equal_count" edges
+        method: "sort" or "bincount"
+
+    Returns:
+        RadialProfile: Per-bin count, mean, dispersion and radius range
+    """
+    return profile_from_edges(r, v, bin_edges(r, n_bins, scheme), scheme, method)
+
+
+def median_split(
+    r: np.ndarray,
+    v: np.ndarray,
+    median_r: Optional[float] = None,
+    method: str = "sort"
+) -> RadialProfile:
+    """
+    The classic inner/outer split as a 3-bin profile.
+
+    Bin 0 holds r < median and bin 2 holds r > median. Bin 1 holds the
+    particles exactly at the median, which neither region counts.
+    """
+    if median_r is None:
+        median_r = np.median(r)
+    edges = np.array([
+        min(r.min(), median_r), median_r, np.nextafter(median_r, np.inf),
+        max(r.max(), np.nextafter(median_r, np.inf))
+    ])
+    return profile_from_edges(r, v, edges, "median_split", method)
+
+
+@dataclass
+class RegionMoments:
+    """
+    Mergeable speed moments of one region, shifted by `shift`:
+    total = sum(v - shift), total_sq = sum((v - shift) ** 2).
+    """
+    shift: float
+    count: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+    r_min: float = np.inf
+    r_max: float = -np.inf
+
+    def merge(self, other: "RegionMoments") -> "RegionMoments":
+        """Combined moments of two disjoint parts (same shift)."""
+        return RegionMoments(
+            self.shift,
+            self.count + other.count,
+            self.total + other.total,
+            self.total_sq + other.total_sq,
+            min(self.r_min, other.r_min),
+            max(self.r_max, other.r_max)
+        )
+
+    @property
+    def mean(self) -> float:
+        return self.shift + self.total / self.count if self.count else np.nan
+
+    @property
+    def std(self) -> float:
+        if not self.count:
+            return np.nan
+        centered = self.total / self.count
+        return float(np.sqrt(max(self.total_sq / self.count - centered * centered, 0.0)))
+
+
+def _span_moments(task) -> Tuple[RegionMoments, RegionMoments]:
+    # One contiguous span, chunk by chunk: moments of r < split and r > split.
+    # Only the inner region is reduced under a mask; the outer one is the
+    # chunk total minus inner minus the (rare) particles exactly at split.
+    r, v, split, shift, chunk_size = task
+    inner = RegionMoments(shift)
+    outer = RegionMoments(shift)
+    for start in range(0, len(r), chunk_size):
+        rc = r[start:start + chunk_size]
+        dv = v[start:start + chunk_size] - shift
+        sq = dv * dv
+        mask = rc < split
+        n_in = int(np.count_nonzero(mask))
+        s_in = float(np.sum(dv, where=mask))
+        q_in = float(np.sum(sq, where=mask))
+        np.equal(rc, split, out=mask)
+        n_at = int(np.count_nonzero(mask))
+        s_at = float(np.sum(dv, where=mask)) if n_at else 0.0
+        q_at = float(np.sum(sq, where=mask)) if n_at else 0.0
+
+        inner.count += n_in
+        inner.total += s_in
+        inner.total_sq += q_in
+        outer.count += len(rc) - n_in - n_at
+        outer.total += float(np.sum(dv)) - s_in - s_at
+        outer.total_sq += float(np.sum(sq)) - q_in - q_at
+
+        # The chunk's extreme radii belong to the region they fall in
+        lo, hi = float(np.min(rc)), float(np.max(rc))
+        if lo < split:
+            inner.r_min = min(inner.r_min, lo)
+        if hi > split:
+            outer.r_max = max(outer.r_max, hi)
+    return inner, outer
+
+
+def split_moments(
+    r: np.ndarray,
+    v: np.ndarray,
+    split: float,
+    chunk_size: int = DEFAULT_CHUNK_TICKS,
+    executor: Union[str, Executor] = "serial",
+    max_workers: Optional[int] = None
+) -> Tuple[RegionMoments, RegionMoments]:
+    """
+    Fused one-pass moments of speeds `v` for r < split and r > split.
+
+    Extra memory is a few chunk-sized temporaries per worker. With a
+    thread pool, contiguous spans are reduced concurrently (NumPy releases
+    the GIL in the reductions) and merged in span order, so results are
+    deterministic for a given worker count.
+
+    Args:
+        r: (N,) particle radii
+        v: (N,) particle speeds
+        split: Region boundary (the median radius)
+        chunk_size: Particles per step
+        executor: Backend spec, as for SimulationConfig.executor
+            ("threads" is the useful parallel choice here)
+        max_workers: Spans reduced concurrently (default: all CPUs)
+
+    Returns:
+        Tuple[RegionMoments, RegionMoments]: (inner, outer)
+    """
+    shift = float(np.mean(v[:chunk_size])) if len(v) else 0.0
+    max_workers = max_workers or default_workers()
+    n_spans = 1 if is_serial(executor, max_workers) else max_workers
+    with executor_for(executor, max_workers) as pool:
+        bounds = np.linspace(0, len(r), n_spans + 1).astype(np.int64)
+        tasks = [
+            (r[a:b], v[a:b], split, shift, chunk_size)
+            for a, b in zip(bounds[:-1], bounds[1:])
+        ]
+        inner, outer = RegionMoments(shift), RegionMoments(shift)
+        for span_inner, span_outer in pool.map(_span_moments, tasks):
+            inner = inner.merge(span_inner)
+            outer = outer.merge(span_outer)
+    return inner, outer
+
+
+@dataclass
+class Welford:
+    """Mergeable running count, mean, M2 and range of a stream of values."""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    lo: float = np.inf
+    hi: float = -np.inf
+
+    def merge(self, other: "Welford") -> "Welford":
+        """Accumulator of both streams (Chan et al. pairwise update)."""
+        if not other.count:
+            return dataclasses.replace(self)
+        if not self.count:
+            return dataclasses.replace(other)
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        return Welford(
+            n,
+            self.mean + delta * other.count / n,
+            self.m2 + other.m2 + delta * delta * self.count * other.count / n,
+            min(self.lo, other.lo),
+            max(self.hi, other.hi)
+        )
+
+    def update(self, values: np.ndarray) -> "Welford":
+        """Fold in a chunk of values (in place); returns self."""
+        if len(values):
+            mean = float(np.mean(values))
+            chunk = Welford(
+                len(values), mean, float(np.sum(np.square(values - mean))),
+                float(np.min(values)), float(np.max(values))
+            )
+            merged = self.merge(chunk)
+            self.count, self.mean, self.m2, self.lo, self.hi = (
+                merged.count, merged.mean, merged.m2, merged.lo, merged.hi
+            )
+        return self
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation (as np.std)."""
+        return float(np.sqrt(self.m2 / self.count)) if self.count else np.nan
+
+
+# Relative accuracy of RadialSketch quantiles
+DEFAULT_SKETCH_ALPHA = 1e-3
+
+
+class RadialSketch:
+    """
+    Mergeable quantile sketch of radii with speed moments per bucket.
+
+    Radii fall into logarithmic buckets (r in (gamma^(k-1), gamma^k],
+    gamma = (1 + alpha) / (1 - alpha)), so any quantile is known to a
+    relative accuracy alpha from O(log(r_max / r_min) / alpha) buckets,
+    independent of N. Each bucket also keeps the exact radius range and
+    Welford moments of the speeds that fell into it.
+    """
+
+    def __init__(self, alpha: float = DEFAULT_SKETCH_ALPHA):
+        self.alpha = alpha
+        self.log_gamma = np.log((1.0 + alpha) / (1.0 - alpha))
+        self.keys = np.empty(0, dtype=np.int64)
+        self.count = np.empty(0, dtype=np.int64)
+        self.mean = np.empty(0)
+        self.m2 = np.empty(0)
+        self.r_min = np.empty(0)
+        self.r_max = np.empty(0)
+
+    @property
+    def n(self) -> int:
+        return int(self.count.sum())
+
+    def _combine(self, keys, count, mean, m2, r_min, r_max):
+        # Merge per-bucket statistics into this sketch (Chan update)
+        union = np.union1d(self.keys, keys)
+        n = np.zeros(len(union), dtype=np.int64)
+        mu = np.zeros(len(union))
+        s2 = np.zeros(len(union))
+        lo = np.full(len(union), np.inf)
+        hi = np.full(len(union), -np.inf)
+        for k, c, m, q, a, b in (
+            (self.keys, self.count, self.mean, self.m2, self.r_min, self.r_max),
+            (keys, count, mean, m2, r_min, r_max),
+        ):
+            pos = np.searchsorted(union, k)
+            total = n[pos] + c
+            delta = m - mu[pos]
+            s2[pos] += q + delta * delta * n[pos] * c / total
+            mu[pos] += delta * c / total
+            n[pos] = total
+            lo[pos] = np.minimum(lo[pos], a)
+            hi[pos] = np.maximum(hi[pos], b)
+        self.keys, self.count, self.mean, self.m2, self.r_min, self.r_max = union, n, mu, s2, lo, hi
+
+    def update(self, r: np.ndarray, v: np.ndarray) -> "RadialSketch":
+        """Fold in a chunk of radii and speeds (in place); returns self."""
+        if len(r):
+            k = np.ceil(np.log(np.maximum(r, np.finfo(np.float64).tiny)) / self.log_gamma)
+            keys, inverse, count = np.unique(k.astype(np.int64), return_inverse=True, return_counts=True)
+            mean = np.bincount(inverse, weights=v) / count
+            dev = v - mean[inverse]
+            m2 = np.bincount(inverse, weights=dev * dev)
+            r_min = np.full(len(keys), np.inf)
+            r_max = np.full(len(keys), -np.inf)
+            np.minimum.at(r_min, inverse, r)
+            np.maximum.at(r_max, inverse, r)
+            self._combine(keys, count, mean, m2, r_min, r_max)
+        return self
+
+    def merge(self, other: "RadialSketch") -> "RadialSketch":
+        """Sketch of both streams; alphas must match."""
+        if other.alpha != self.alpha:
+            raise ValueError(f"cannot merge sketches with alpha {self.alpha} and {other.alpha}")
+        merged = RadialSketch(self.alpha)
+        merged._combine(self.keys, self.count, self.mean, self.m2, self.r_min, self.r_max)
+        merged._combine(other.keys, other.count, other.mean, other.m2, other.r_min, other.r_max)
+        return merged
+
+    def bucket_of_rank(self, rank: int) -> int:
+        """
+        Index (into keys) of the bucket holding the rank-th smallest radius.
+
+        Raises:
+            ValueError: If the sketch is empty or `rank` is out of range
+        """
+        if not 0 <= rank < self.n:
+            if not self.n:
+                raise ValueError("empty sketch: no radii to rank")
+            raise ValueError(f"rank {rank} out of range for a sketch of {self.n} radii")
+        return int(np.searchsorted(np.cumsum(self.count), rank, side="right"))
+
+    def value_of_rank(self, rank: int) -> float:
+        """The rank-th smallest radius, to relative accuracy alpha."""
+        b = self.bucket_of_rank(rank)
+        estimate = 2.0 * np.exp(self.keys[b] * self.log_gamma) / (1.0 + np.exp(self.log_gamma))
+        return float(np.clip(estimate, self.r_min[b], self.r_max[b]))
+
+    def quantile(self, q: float) -> float:
+        """Radius quantile (lower order statistic), to relative accuracy alpha."""
+        return self.value_of_rank(int(q * (self.n - 1)))
+
+    def median(self) -> float:
+        """Median radius as np.median defines it, to relative accuracy alpha."""
+        n = self.n
+        return (self.value_of_rank((n - 1) // 2) + self.value_of_rank(n // 2)) / 2.0
+
+    def median_buckets(self) -> Tuple[int, int]:
+        """Bucket indices holding the lower and upper middle radius."""
+        n = self.n
+        return self.bucket_of_rank((n - 1) // 2), self.bucket_of_rank(n // 2)
+
+    def moments(self, buckets: slice) -> Welford:
+        """Speed moments over a range of buckets; lo/hi hold their radius range."""
+        count = self.count[buckets]
+        n = int(count.sum())
+        if not n:
+            return Welford()
+        mean = float(np.sum(count * self.mean[buckets]) / n)
+        delta = self.mean[buckets] - mean
+        m2 = float(np.sum(self.m2[buckets]) + np.sum(count * delta * delta))
+        filled = count > 0
+        return Welford(
+            n, mean, m2,
+            float(self.r_min[buckets][filled].min()), float(self.r_max[buckets][filled].max())
+        )
+
+
+class SplitPass:
+    """
+    Second pass of an exact streaming split, mergeable across workers.
+
+    Radii below `lo` (outside the median buckets) are folded into the
+    inner accumulator and radii above `hi` into the outer one; the few
+    particles in [lo, hi] are kept until the exact median is known.
+    """
+
+    def __init__(self, lo: float, hi: float):
+        self.lo = lo
+        self.hi = hi
+        self.inner = Welford()
+        self.outer = Welford()
+        self.inner_r = np.inf
+        self.outer_r = -np.inf
+        self.band_r: List[np.ndarray] = []
+        self.band_v: List[np.ndarray] = []
+
+    def update(self, r: np.ndarray, v: np.ndarray) -> "SplitPass":
+        below = r < self.lo
+        above = r > self.hi
+        band = ~(below | above)
+        self.inner.update(v[below])
+        self.outer.update(v[above])
+        if below.any():
+            self.inner_r = min(self.inner_r, float(r[below].min()))
+        if above.any():
+            self.outer_r = max(self.outer_r, float(r[above].max()))
+        if band.any():
+            self.band_r.append(r[band])
+            self.band_v.append(v[band])
+        return self
+
+    def merge(self, other: "SplitPass") -> "SplitPass":
+        merged = SplitPass(self.lo, self.hi)
+        merged.inner = self.inner.merge(other.inner)
+        merged.outer = self.outer.merge(other.outer)
+        merged.inner_r = min(self.inner_r, other.inner_r)
+        merged.outer_r = max(self.outer_r, other.outer_r)
+        merged.band_r = self.band_r + other.band_r
+        merged.band_v = self.band_v + other.band_v
+        return merged
+
+    def finish(self, n: int) -> Tuple[float, Welford, Welford]:
+        """
+        Resolve the median band of a stream of `n` particles.
+
+        Returns:
+            Tuple[float, Welford, Welford]: (median radius, inner speeds,
+                outer speeds); lo/hi of the speed accumulators are replaced
+                by the smallest inner and largest outer radius
+
+        Raises:
+            ValueError: If `n` is 0 (an empty stream has no median)
+        """
+        if n <= 0:
+            raise ValueError(f"cannot split a stream of {n} particles")
+        band_r = np.concatenate(self.band_r) if self.band_r else np.empty(0)
+        band_v = np.concatenate(self.band_v) if self.band_v else np.empty(0)
+        order = np.sort(band_r)
+        lower = order[(n - 1) // 2 - self.inner.count]
+        upper = order[n // 2 - self.inner.count]
+        median = lower if n % 2 else (lower + upper) / 2.0
+
+        below, above = band_r < median, band_r > median
+        inner = self.inner.merge(Welford().update(band_v[below]))
+        outer = self.outer.merge(Welford().update(band_v[above]))
+        inner.lo = min(self.inner_r, float(band_r[below].min())) if below.any() else self.inner_r
+        outer.hi = max(self.outer_r, float(band_r[above].max())) if above.any() else self.outer_r
+        return median, inner, outer
+
+
+def iter_speeds(
+    chunks: Iterable[Tuple[np.ndarray, np.ndarray]]
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Radii, speeds and masses of a stream of (coords, mass) chunks.
+
+    Speeds are |np.gradient(coords, axis=0)| * 10 of the whole stream,
+    bit for bit: each chunk is emitted with a one-row delay so that every
+    row's central difference sees its successor.
+
+    Yields:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (r, v, mass) per chunk
+    """
+    tail = None       # Last two rows seen so far
+    tail_mass = None
+    for coords, mass in chunks:
+        if len(coords) == 0:
+            continue
+        if tail is None:
+            rows, masses, first = coords, mass, 0
+        else:
+            rows = np.concatenate([tail, coords])
+            masses = np.concatenate([tail_mass, mass])
+            first = len(tail) - 1  # The pending row of the previous chunk
+        stop = len(rows) - 1       # Hold back the last row
+        if stop > first:
+            vel = np.empty((stop - first, rows.shape[1]))
+            lo = first
+            if first == 0:
+                vel[0] = (rows[1] - rows[0]) / 1.0  # Forward difference at the start
+                lo = 1
+            vel[lo - first:] = (rows[lo + 1:stop + 1] - rows[lo - 1:stop - 1]) / 2.0
+            yield (
+                np.linalg.norm(rows[first:stop], axis=1),
+                np.linalg.norm(vel, axis=1) * 10.0,
+                masses[first:stop]
+            )
+        tail = rows[-2:].copy()
+        tail_mass = masses[-2:].copy()
+
+    if tail is not None and len(tail) == 2:
+        vel = (tail[1:] - tail[:1]) / 1.0  # Backward difference at the end
+        yield np.linalg.norm(tail[1:], axis=1), np.linalg.norm(vel, axis=1) * 10.0, tail_mass[1:]
+
+
+def span_speeds(
+    coords: np.ndarray,
+    mass: np.ndarray,
+    start: int,
+    stop: int,
+    chunk_size: int = DEFAULT_CHUNK_TICKS
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    iter_speeds() of rows start..stop of a (memory-mapped) coords array,
+    reading one halo row on each side, so that workers covering disjoint
+    spans together see exactly the speeds of the whole array.
+    """
+    lo, hi = max(start - 1, 0), min(stop + 1, len(coords))
+    chunks = (
+        (coords[a:min(a + chunk_size, hi)], mass[a:min(a + chunk_size, hi)])
+        for a in range(lo, hi, chunk_size)
+    )
+    row = lo
+    for r, v, m in iter_speeds(chunks):
+        keep = slice(max(start - row, 0), max(min(stop - row, len(r)), 0))
+        row += len(r)
+        if keep.stop > keep.start:
+            yield r[keep], v[keep], m[keep]
+
+
+def stream_split(
+    chunks: Callable[[], Iterable[Tuple[np.ndarray, np.ndarray]]],
+    exact: bool = True,
+    alpha: float = DEFAULT_SKETCH_ALPHA
+) -> Tuple[float, Welford, Welford, Welford]:
+    """
+    Inner/outer split at the median radius of a chunked particle stream.
+
+    Args:
+        chunks: Zero-argument callable returning an iterable of (coords,
+            mass) chunks in particle order; called once per pass
+        exact: Resolve the median buckets in a second pass (exact median
+            and membership); otherwise the particles of the median buckets
+            are left out of both regions and the median is estimated
+        alpha: Relative accuracy of the radius sketch
+
+    Returns:
+        Tuple[float, Welford, Welford, Welford]: (median radius, inner
+            speeds, outer speeds, masses); lo of the inner and hi of the
+            outer accumulator are the smallest inner and largest outer radius
+
+    Raises:
+        ValueError: If the stream yields no particles
+    """
+    sketch = RadialSketch(alpha)
+    masses = Welford()
+    for r, v, m in iter_speeds(chunks()):
+        sketch.update(r, v)
+        masses.update(m)
+    if not masses.count:
+        raise ValueError("cannot split an empty particle stream")
+    lower, upper = sketch.median_buckets()
+
+    if not exact:
+        inner = sketch.moments(slice(0, lower))
+        outer = sketch.moments(slice(upper + 1, None))
+        return sketch.median(), inner, outer, masses
+
+    split = SplitPass(float(sketch.r_min[lower]), float(sketch.r_max[upper]))
+    for r, v, _ in iter_speeds(chunks()):
+        split.update(r, v)
+    median, inner, outer = split.finish(masses.count)
+    return median, inner, outer, masses
+
+
+def verify_empty_stream() -> bool:
+    """
+    Self-check: empty streams, sketches and split passes must raise
+    ValueError instead of failing on a median bucket lookup.
+
+    Raises:
+        AssertionError: If any of them does not raise ValueError
+    """
+    empty = (np.empty((0, 3)), np.empty(0))
+    cases = {
+        "stream_split(no chunks)": lambda: stream_split(lambda: iter(())),
+        "stream_split(empty chunks)": lambda: stream_split(lambda: iter([empty, empty])),
+        "stream_split(exact=False)": lambda: stream_split(lambda: iter(()), exact=False),
+        "RadialSketch.median_buckets": lambda: RadialSketch().median_buckets(),
+        "RadialSketch.median": lambda: RadialSketch().median(),
+        "SplitPass.finish(0)": lambda: SplitPass(0.0, 1.0).finish(0),
+    }
+    for name, call in cases.items():
+        try:
+            call()
+        except ValueError:
+            continue
+        except Exception as exc:
+            raise AssertionError(f"{name} raised {type(exc).__name__}, expected ValueError")
+        raise AssertionError(f"{name} did not raise on an empty stream")
+    return True
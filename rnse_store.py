@@ -0,0 +1,266 @@
+"""
+RNSE TICK STORE: Memory-Mapped Binary Audit Logs
+Version: 0.74-AUDIT
+
+On-disk format for engine output that can be opened with np.memmap:
+
+    [8B magic "RNSETCK1"][8B little-endian trailer offset]
+    [N fixed-width TICK_DTYPE records]
+    [UTF-8 JSON trailer: seed, params, interp labels, key order,
+     Merkle roots, SHA-256 of the source JSONL, engine state at the end
+     of the run if known]
+
+The header lives in a trailer so that a JSONL log can be converted in one
+streaming pass. Conversion to and from `audit.jsonl` is verified to be
+byte-exact, so published SHA-256 digests remain reproducible.
+
+Author: Elad Genish
+License: MIT (core) + Proprietary (patent)
+"""
+
+import base64
+import hashlib
+import json
+import struct
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from rnse_ticks import DEFAULT_CHUNK_TICKS, TICK_DTYPE, TickColumns
+
+
+STORE_MAGIC = b"RNSETCK1"
+STORE_VERSION = 1
+_PREAMBLE = struct.Struct("<8sQ")
+
+
+class TickStore:
+    """
+    Read-only memory-mapped view of a tick store file.
+
+    `records` is an np.memmap of TICK_DTYPE rows; nothing is read into RAM
+    until a slice is touched.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, trailer_offset = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+            if magic != STORE_MAGIC:
+                raise ValueError(f"{path}: not an RNSE tick store")
+            f.seek(trailer_offset)
+            self.header: Dict = json.loads(f.read().decode("utf-8"))
+
+        if self.header["version"] != STORE_VERSION:
+            raise ValueError(f"{path}: unsupported store version {self.header['version']}")
+
+        n = self.header["n_ticks"]
+        if n:
+            self.records = np.memmap(
+                path, dtype=TICK_DTYPE, mode="r", offset=_PREAMBLE.size, shape=(n,)
+            )
+        else:
+            self.records = np.empty(0, dtype=TICK_DTYPE)
+
+    def __len__(self) -> int:
+        return self.header["n_ticks"]
+
+    @property
+    def seed(self) -> Optional[int]:
+        return self.header["seed"]
+
+    @property
+    def merkle_roots(self) -> List:
+        return self.header["merkle_roots"]
+
+    @property
+    def engine_state(self) -> Optional[bytes]:
+        """Serialized engine state after the last tick (None if not recorded)."""
+        state = self.header.get("engine_state")
+        return base64.b64decode(state) if state is not None else None
+
+    def columns(self, start: int = 0, stop: Optional[int] = None) -> TickColumns:
+        """Memory-mapped TickColumns over records[start:stop]."""
+        return TickColumns.from_records(
+            self.records[start:stop],
+            self.header["params"],
+            self.header["interp_labels"],
+            tuple(self.header["keys"])
+        )
+
+    def iter_columns(self, chunk_size: int = DEFAULT_CHUNK_TICKS) -> Iterator[TickColumns]:
+        """Yield TickColumns chunks of at most `chunk_size` ticks."""
+        for start in range(0, len(self), chunk_size):
+            yield self.columns(start, start + chunk_size)
+
+
+def open_store(path: str) -> TickStore:
+    """Open a tick store for memory-mapped reading."""
+    return TickStore(path)
+
+
+def _write_trailer(f: BinaryIO, header: Dict):
+    trailer_offset = f.tell()
+    f.write(json.dumps(header, indent=2).encode("utf-8"))
+    f.seek(0)
+    f.write(_PREAMBLE.pack(STORE_MAGIC, trailer_offset))
+
+
+def write_store(
+    path: str,
+    ticks: TickColumns,
+    seed: Optional[int] = None,
+    merkle_roots: Optional[Sequence] = None,
+    engine_state: Optional[bytes] = None
+) -> TickStore:
+    """
+    Write in-memory ticks to a store file.
+
+    Args:
+        path: Destination file
+        ticks: Columns of one engine run
+        seed: Run seed (defaults to the first tick's seed64)
+        merkle_roots: Roots reported by `rnse_core.py --merkle-R`
+        engine_state: Engine state after the last tick, for resuming the
+            stream (see rnse_checkpoint)
+
+    Returns:
+        TickStore: The freshly written store, opened for reading
+    """
+    records = ticks.to_records()
+    if seed is None and len(records):
+        seed = int(records["seed64"][0])
+
+    with open(path, "wb") as f:
+        f.write(_PREAMBLE.pack(STORE_MAGIC, 0))
+        f.write(records.tobytes())
+        _write_trailer(f, {
+            "version": STORE_VERSION,
+            "n_ticks": len(records),
+            "seed": seed,
+            "params": ticks.params,
+            "interp_labels": ticks.interp_labels,
+            "keys": list(ticks.keys),
+            "merkle_roots": list(merkle_roots or []),
+            "trailing_newline": True,
+            "jsonl_sha256": None,
+            "engine_state": (
+                base64.b64encode(engine_state).decode("ascii")
+                if engine_state is not None else None
+            ),
+        })
+    return TickStore(path)
+
+
+def _iter_line_chunks(f: BinaryIO, chunk_size: int) -> Iterator[List[bytes]]:
+    chunk: List[bytes] = []
+    for line in f:
+        chunk.append(line)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def jsonl_to_store(
+    jsonl_path: str,
+    store_path: str,
+    seed: Optional[int] = None,
+    merkle_roots: Optional[Sequence] = None,
+    chunk_size: int = DEFAULT_CHUNK_TICKS
+) -> TickStore:
+    """
+    Convert an audit.jsonl log into a tick store in one streaming pass.
+
+    Every chunk is re-rendered from its records and compared byte for byte
+    with the source lines, so the conversion is provably lossless.
+
+    Raises:
+        ValueError: If a line cannot be reproduced exactly from its record,
+            or params change within the log
+    """
+    digest = hashlib.sha256()
+    labels: Dict[str, int] = {}
+    params = None
+    keys = None
+    n = 0
+    trailing_newline = True
+
+    with open(jsonl_path, "rb") as src, open(store_path, "wb") as dst:
+        dst.write(_PREAMBLE.pack(STORE_MAGIC, 0))
+
+        for chunk in _iter_line_chunks(src, chunk_size):
+            for line in chunk:
+                digest.update(line)
+            trailing_newline = chunk[-1].endswith(b"\n")
+            lines = [line.rstrip(b"\n") for line in chunk]
+
+            ticks = TickColumns.from_lines(lines)
+            if ticks.to_lines() != lines:
+                raise ValueError(f"{jsonl_path}: ticks {n}..{n + len(lines)} do not round-trip")
+            if params is None:
+                params, keys = ticks.params, ticks.keys
+            elif ticks.params != params or ticks.keys != keys:
+                raise ValueError(f"{jsonl_path}: params change near tick {n}")
+
+            # Remap chunk-local interp codes onto the store-wide label table
+            remap = np.array(
+                [labels.setdefault(label, len(labels)) for label in ticks.interp_labels],
+                dtype=np.uint8
+            )
+            records = ticks.to_records()
+            if len(remap):
+                records["interp"] = remap[records["interp"]]
+            dst.write(records.tobytes())
+
+            if seed is None and n == 0:
+                seed = int(records["seed64"][0])
+            n += len(records)
+
+        _write_trailer(dst, {
+            "version": STORE_VERSION,
+            "n_ticks": n,
+            "seed": seed,
+            "params": params or {},
+            "interp_labels": list(labels),
+            "keys": list(keys or ()),
+            "merkle_roots": list(merkle_roots or []),
+            "trailing_newline": trailing_newline,
+            "jsonl_sha256": digest.hexdigest(),
+        })
+    return TickStore(store_path)
+
+
+def store_to_jsonl(
+    store_path: str,
+    jsonl_path: str,
+    chunk_size: int = DEFAULT_CHUNK_TICKS
+) -> str:
+    """
+    Render a tick store back to audit.jsonl.
+
+    Returns:
+        str: SHA-256 of the written file
+
+    Raises:
+        ValueError: If the store records the digest of its source log and
+            the rendered file does not match it
+    """
+    store = open_store(store_path)
+    digest = hashlib.sha256()
+    n = len(store)
+    written = 0
+
+    with open(jsonl_path, "wb") as f:
+        for ticks in store.iter_columns(chunk_size):
+            written += len(ticks)
+            last = written == n and not store.header["trailing_newline"]
+            blob = b"\n".join(ticks.to_lines()) + (b"" if last else b"\n")
+            digest.update(blob)
+            f.write(blob)
+
+    expected = store.header.get("jsonl_sha256")
+    if expected and digest.hexdigest() != expected:
+        raise ValueError(f"{store_path}: rendered JSONL digest does not match source")
+    return digest.hexdigest()
@@ -0,0 +1,462 @@
+"""
+RNSE TICK SCHEMA: Columnar In-Memory Representation of Engine Output
+Version: 0.74-AUDIT
+
+Each RNSE tick is documented in RNSE_Audit_Suite_v0.74.md as a JSON audit
+entry. This module defines the binary columnar form of that entry: one
+contiguous buffer per field, wrapped with np.frombuffer without copying.
+The JSON lines remain derivable from the columns, so the audit digest is
+unaffected by the in-memory representation.
+
+Author: Elad Genish
+License: MIT (core) + Proprietary (patent)
+"""
+
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rnse_parallel import SharedArray, default_workers
+
+
+# Column layout: (field name, dtype, width). Order matches the audit entry.
+TICK_COLUMNS: Tuple[Tuple[str, type, int], ...] = (
+    ("t", np.int64, 1),
+    ("seed64", np.uint64, 1),
+    ("C", np.float64, 1),
+    ("accepted", np.int64, 1),
+    ("x", np.float64, 1),
+    ("h", np.float64, 1),
+    ("D", np.float64, 1),
+    ("w", np.float64, 3),
+    ("noise", np.float64, 1),
+    ("interp", np.uint8, 1),  # Categorical code into interp_labels
+)
+
+# Canonical structured record for one tick: the interchange type between
+# rnse_core results, MultiThreadRNSE and on-disk stores. `interp` is stored
+# as a uint8 code into a per-run label table.
+TICK_DTYPE = np.dtype([
+    (name, np.dtype(dtype).newbyteorder("<"), (width,)) if width > 1
+    else (name, np.dtype(dtype).newbyteorder("<"))
+    for name, dtype, width in TICK_COLUMNS
+])
+
+# Scalar fields that the projection decoder can extract from JSON text
+PROJECTABLE_FIELDS: Dict[str, type] = {
+    name: dtype for name, dtype, width in TICK_COLUMNS
+    if width == 1 and name != "interp"
+}
+
+# Default number of ticks per streamed chunk
+DEFAULT_CHUNK_TICKS = 1 << 16
+
+# Key order of a JSON audit entry as written by rnse_core
+TICK_KEYS: Tuple[str, ...] = (
+    "t", "seed64", "params", "C", "accepted", "x",
+    "h", "D", "w", "interp", "noise"
+)
+
+
+@dataclass
+class TickColumns:
+    """
+    Columnar view of one engine run.
+
+    `data` maps each field of TICK_COLUMNS to a NumPy array of length N
+    (shape (N, 3) for `w`). `params` is the per-tick params object, which
+    is constant across a run, and `interp_labels` decodes the `interp`
+    column.
+    """
+    data: Dict[str, np.ndarray]
+    params: Dict = field(default_factory=dict)
+    interp_labels: List[str] = field(default_factory=list)
+    keys: Tuple[str, ...] = TICK_KEYS
+
+    def __len__(self) -> int:
+        return len(self.data["x"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.data[name]
+
+    @classmethod
+    def from_buffers(
+        cls,
+        buffers: Dict[str, bytes],
+        params: Dict,
+        interp_labels: Sequence[str]
+    ) -> "TickColumns":
+        """
+        Wrap raw column buffers (bytes, bytearray, memoryview) with zero copies.
+
+        Args:
+            buffers: Field name -> contiguous little-endian buffer
+            params: The run's params object
+            interp_labels: Labels indexed by the `interp` code column
+
+        Returns:
+            TickColumns: Read-only views over the buffers
+        """
+        data = {}
+        for name, dtype, width in TICK_COLUMNS:
+            arr = np.frombuffer(buffers[name], dtype=np.dtype(dtype).newbyteorder("<"))
+            data[name] = arr.reshape(-1, width) if width > 1 else arr
+        return cls(data=data, params=dict(params), interp_labels=list(interp_labels))
+
+    @classmethod
+    def from_lines(cls, lines: Sequence[bytes]) -> "TickColumns":
+        """
+        Transcode JSON audit lines into columns in bulk (see decode_records).
+
+        Args:
+            lines: JSON-encoded tick entries
+
+        Returns:
+            TickColumns: Column views over a freshly filled TICK_DTYPE array
+        """
+        return cls.from_blob(b"\n".join(lines), len(lines))
+
+    @classmethod
+    def from_blob(cls, blob: bytes, n_ticks: int = -1) -> "TickColumns":
+        """Bulk-decode newline-delimited JSON ticks (e.g. audit.jsonl contents)."""
+        records, labels = decode_records(blob, n_ticks)
+        if len(records) == 0:
+            return cls.from_records(records, {}, labels)
+
+        # The first entry supplies params and key order; params must not vary
+        first = json.loads(blob[:blob.find(b"\n")] if b"\n" in blob else blob)
+        if len(set(_PARAMS_PATTERN.findall(blob))) > 1:
+            raise ValueError("params change within the run; not columnar")
+        return cls.from_records(records, first["params"], labels, tuple(first.keys()))
+
+    @classmethod
+    def from_records(
+        cls,
+        records: np.ndarray,
+        params: Dict,
+        interp_labels: Sequence[str],
+        keys: Tuple[str, ...] = TICK_KEYS
+    ) -> "TickColumns":
+        """Column views over a TICK_DTYPE structured array (no copy)."""
+        if records.dtype != TICK_DTYPE:
+            raise TypeError(f"expected TICK_DTYPE records, got {records.dtype}")
+        return cls(
+            data={name: records[name] for name in TICK_DTYPE.names},
+            params=dict(params),
+            interp_labels=list(interp_labels),
+            keys=keys
+        )
+
+    @classmethod
+    def from_result(cls, res: Dict) -> "TickColumns":
+        """
+        Build columns from an `rnse_core.rnse_run` result.
+
+        Engine builds that emit the binary columnar mode return
+        `res["columns"]` (plus `params` and `interp_labels`) and are wrapped
+        without touching text. Older builds only return `res["lines"]`,
+        which are transcoded once here.
+        """
+        if "columns" in res:
+            return cls.from_buffers(
+                res["columns"],
+                res.get("params", {}),
+                res.get("interp_labels", [])
+            )
+        return cls.from_lines(res["lines"])
+
+    @classmethod
+    def concat(cls, parts: Sequence["TickColumns"]) -> "TickColumns":
+        """
+        Join consecutive pieces of one run (e.g. a cached prefix and its
+        resumed continuation), remapping `interp` codes onto the union of
+        their labels.
+
+        Raises:
+            ValueError: If the pieces have different params
+        """
+        parts = [part for part in parts if len(part)] or list(parts[:1])
+        labels: List[str] = []
+        chunks = []
+        for part in parts:
+            if part.params != parts[0].params:
+                raise ValueError("params change within the run; not columnar")
+            for label in part.interp_labels:
+                if label not in labels:
+                    labels.append(label)
+            if len(labels) > 256:
+                raise ValueError("more than 256 distinct interp labels")
+            records = part.to_records()
+            codes = np.array([labels.index(label) for label in part.interp_labels], dtype=np.uint8)
+            if len(records):
+                records["interp"] = codes[records["interp"]]
+            chunks.append(records)
+        return cls.from_records(np.concatenate(chunks), parts[0].params, labels, parts[0].keys)
+
+    def to_buffers(self) -> Dict[str, bytes]:
+        """Serialize each column to its contiguous little-endian buffer."""
+        return {
+            name: np.ascontiguousarray(
+                self.data[name], dtype=np.dtype(dtype).newbyteorder("<")
+            ).tobytes()
+            for name, dtype, _ in TICK_COLUMNS
+        }
+
+    def to_records(self) -> np.ndarray:
+        """Pack the columns into one TICK_DTYPE structured array."""
+        records = np.empty(len(self), dtype=TICK_DTYPE)
+        for name in TICK_DTYPE.names:
+            records[name] = self.data[name]
+        return records
+
+    def to_lines(self) -> List[bytes]:
+        """
+        Re-derive the JSON audit lines from the columns.
+
+        Returns:
+            List[bytes]: One UTF-8 JSON entry per tick, as rnse_core writes them
+        """
+        cols = {name: self.data[name].tolist() for name, _, _ in TICK_COLUMNS}
+        lines = []
+        for i in range(len(self)):
+            entry = {}
+            for key in self.keys:
+                if key == "params":
+                    entry[key] = self.params
+                elif key == "interp":
+                    entry[key] = self.interp_labels[cols["interp"][i]]
+                else:
+                    entry[key] = cols[key][i]
+            lines.append(json.dumps(entry).encode("utf-8"))
+        return lines
+
+
+def _field_pattern(name: str) -> "re.Pattern":
+    # Field names are unique across the entry (params keys do not collide),
+    # so a key match never lands inside the nested params object.
+    return re.compile(rb'"' + name.encode("ascii") + rb'"\s*:\s*([^,}\s]+)')
+
+
+_W_PATTERN = re.compile(rb'"w"\s*:\s*\[([^\]]*)\]')
+_INTERP_PATTERN = re.compile(rb'"interp"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_PARAMS_PATTERN = re.compile(rb'"params"\s*:\s*(\{[^}]*\})')
+
+
+def project_blob(
+    blob: bytes,
+    fields: Sequence[str] = ("x", "C"),
+    n_ticks: int = -1
+) -> Dict[str, np.ndarray]:
+    """
+    Extract selected scalar fields from newline-delimited JSON tick entries.
+
+    Only the requested values are scanned and converted; no per-tick dict is
+    built. Values are parsed with float()/int() exactly as json.loads does,
+    so the arrays are bit-identical to the full-parse path.
+
+    Args:
+        blob: Concatenated JSON lines (e.g. the contents of audit.jsonl)
+        fields: Names from PROJECTABLE_FIELDS
+        n_ticks: Expected tick count, or -1 to accept what is found
+
+    Returns:
+        Dict[str, np.ndarray]: Field name -> (N,) array
+    """
+    out = {}
+    for name in fields:
+        if name not in PROJECTABLE_FIELDS:
+            raise ValueError(f"field {name!r} is not a projectable scalar")
+        dtype = np.dtype(PROJECTABLE_FIELDS[name])
+        values = _field_pattern(name).findall(blob)
+        if n_ticks >= 0 and len(values) != n_ticks:
+            raise ValueError(
+                f"field {name!r}: found {len(values)} values for {n_ticks} ticks"
+            )
+        conv = float if dtype.kind == "f" else int
+        out[name] = np.fromiter(map(conv, values), dtype=dtype, count=len(values))
+    return out
+
+
+def project_lines(
+    lines: Sequence[bytes],
+    fields: Sequence[str] = ("x", "C")
+) -> Dict[str, np.ndarray]:
+    """Projection decode of an `rnse_run` line list (see project_blob)."""
+    return project_blob(b"\n".join(lines), fields, len(lines))
+
+
+def _project_into(task) -> int:
+    # Worker side of project_lines_parallel: decode one chunk into its slice
+    blob, fields, start, n_ticks, specs = task
+    decoded = project_blob(blob, fields, n_ticks)
+    for name in fields:
+        dst = SharedArray.attach(specs[name])
+        dst.array[start:start + n_ticks] = decoded[name]
+        dst.close()
+    return n_ticks
+
+
+def project_lines_parallel(
+    lines: Sequence[bytes],
+    fields: Sequence[str] = ("x", "C"),
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_TICKS
+) -> Dict[str, np.ndarray]:
+    """
+    Projection decode split across a process pool.
+
+    Each worker decodes one chunk of lines and writes it into its slice of
+    shared preallocated arrays. Chunks are decoded exactly as in
+    project_lines, so the output is bit-identical to the serial path.
+
+    Args:
+        lines: JSON-encoded tick entries
+        fields: Names from PROJECTABLE_FIELDS
+        workers: Process count (default: all available CPUs)
+        chunk_size: Ticks per task
+
+    Returns:
+        Dict[str, np.ndarray]: Field name -> (N,) array
+    """
+    n = len(lines)
+    workers = workers or default_workers()
+    if workers <= 1 or n <= chunk_size:
+        return project_lines(lines, fields)
+
+    for name in fields:
+        if name not in PROJECTABLE_FIELDS:
+            raise ValueError(f"field {name!r} is not a projectable scalar")
+
+    shared = {name: SharedArray((n,), PROJECTABLE_FIELDS[name]) for name in fields}
+    try:
+        specs = {name: arr.spec() for name, arr in shared.items()}
+        tasks = (
+            (b"\n".join(lines[start:start + chunk_size]), tuple(fields), start,
+             len(lines[start:start + chunk_size]), specs)
+            for start in range(0, n, chunk_size)
+        )
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            decoded = sum(pool.map(_project_into, tasks))
+        if decoded != n:
+            raise RuntimeError(f"decoded {decoded} of {n} ticks")
+        return {name: arr.array.copy() for name, arr in shared.items()}
+    finally:
+        for arr in shared.values():
+            arr.close()
+            arr.unlink()
+
+
+def load_jsonl_fields(
+    path: str,
+    fields: Sequence[str] = ("x", "C")
+) -> Dict[str, np.ndarray]:
+    """Projection decode of an audit.jsonl file written by `rnse_core.py --out`."""
+    with open(path, "rb") as f:
+        blob = f.read()
+    return project_blob(blob, fields, blob.count(b"\n") + (bool(blob) and not blob.endswith(b"\n")))
+
+
+def tick_fields(res: Dict, fields: Sequence[str] = ("x", "C")) -> Dict[str, np.ndarray]:
+    """
+    Fetch only `fields` from an `rnse_core.rnse_run` result.
+
+    Binary columnar results are viewed without copying; JSON-only results go
+    through the projection decoder.
+    """
+    if "columns" in res:
+        ticks = TickColumns.from_result(res)
+        return {name: ticks[name] for name in fields}
+    return project_lines(res["lines"], fields)
+
+
+def iter_tick_chunks(
+    source,
+    fields: Sequence[str] = ("x", "C"),
+    chunk_size: int = DEFAULT_CHUNK_TICKS,
+    decode_workers: int = 1
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Yield `fields` of a tick source in fixed-size tick chunks.
+
+    Columnar sources (TickColumns, including memory-mapped stores, or a
+    result with `columns`) yield views; JSON results are projection-decoded
+    one chunk at a time, so decoded data never exceeds O(chunk_size).
+    With `decode_workers` > 1, JSON results are instead decoded up front by
+    project_lines_parallel (O(N) decoded data, same values).
+
+    Args:
+        source: `rnse_core.rnse_run` result dict or TickColumns
+        fields: Scalar fields to extract
+        chunk_size: Ticks per chunk (the last chunk may be shorter)
+        decode_workers: Processes used to decode JSON lines
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    if isinstance(source, TickColumns):
+        cols = {name: source[name] for name in fields}
+    elif "columns" in source:
+        cols = tick_fields(source, fields)
+    elif decode_workers > 1:
+        cols = project_lines_parallel(source["lines"], fields, decode_workers, chunk_size)
+    else:
+        lines = source["lines"]
+        for start in range(0, len(lines), chunk_size):
+            yield project_lines(lines[start:start + chunk_size], fields)
+        return
+
+    n = len(cols[fields[0]]) if fields else 0
+    for start in range(0, n, chunk_size):
+        yield {name: arr[start:start + chunk_size] for name, arr in cols.items()}
+
+
+def decode_records(blob: bytes, n_ticks: int = -1) -> Tuple[np.ndarray, List[str]]:
+    """
+    Fill a TICK_DTYPE array from newline-delimited JSON ticks in bulk.
+
+    Every field is extracted column-wise by the projection scanner; no
+    per-tick dict is built.
+
+    Args:
+        blob: Concatenated JSON lines
+        n_ticks: Expected tick count, or -1 to accept what is found
+
+    Returns:
+        Tuple[np.ndarray, List[str]]: (records, interp_labels)
+    """
+    scalars = project_blob(blob, tuple(PROJECTABLE_FIELDS), n_ticks)
+    n = len(scalars["x"])
+    records = np.empty(n, dtype=TICK_DTYPE)
+    for name, arr in scalars.items():
+        if len(arr) != n:
+            raise ValueError(f"field {name!r}: found {len(arr)} values for {n} ticks")
+        records[name] = arr
+
+    w_width = TICK_DTYPE["w"].shape[0]
+    w_values = b",".join(_W_PATTERN.findall(blob)).split(b",") if n else []
+    if len(w_values) != n * w_width:
+        raise ValueError(f"field 'w': found {len(w_values)} values for {n} ticks")
+    records["w"] = np.fromiter(map(float, w_values), np.float64, len(w_values)).reshape(n, w_width)
+
+    codes: Dict[bytes, int] = {}
+    raw = _INTERP_PATTERN.findall(blob)
+    if len(raw) != n:
+        raise ValueError(f"field 'interp': found {len(raw)} values for {n} ticks")
+    records["interp"] = np.fromiter(
+        (codes.setdefault(label, len(codes)) for label in raw), np.uint8, n
+    )
+    if len(codes) > 256:
+        raise ValueError("more than 256 distinct interp labels")
+    labels = [json.loads(b'"' + label + b'"') for label in codes]
+    return records, labels
+
+
+def load_ticks(path: str) -> TickColumns:
+    """Bulk-load an audit.jsonl file written by `rnse_core.py --out`."""
+    with open(path, "rb") as f:
+        blob = f.read()
+    return TickColumns.from_blob(blob.rstrip(b"\n"))